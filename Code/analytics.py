@@ -0,0 +1,107 @@
+import threading
+import pandas as pd
+import data_store
+
+# Cross-season analytics over the long-format frame from the season store.
+# Everything is computed with groupby/pivot over all seasons at once and kept
+# in memory, so a team query is a single .loc lookup.
+
+TRAJECTORY_COLUMNS = ['Pts', 'GD', 'LgRk']
+
+_lock = threading.Lock()
+_cache = {}
+
+
+def long_frame():
+    frame = data_store.all_seasons_frame().reset_index(level='Season')
+    frame['Squad'] = frame['Squad'].astype(str)
+    frame['Country'] = frame['Country'].astype(str)
+    return frame.reset_index(drop=True)
+
+
+def team_trajectories(frame):
+    trajectories = frame.pivot_table(index='Squad', columns='Season', values=TRAJECTORY_COLUMNS,
+                                     aggfunc='first')
+    return trajectories.sort_index()
+
+
+def league_strength(frame):
+    frame = frame.assign(GF_per_game=frame['GF'] / frame['MP'], Pts_per_game=frame['Pts'] / frame['MP'])
+    grouped = frame.groupby(['Season', 'Country'], sort=True)
+    strength = grouped.agg(
+        teams=('Squad', 'size'),
+        goals_per_game=('GF_per_game', 'mean'),
+        points_per_game=('Pts_per_game', 'mean'),
+        points_spread=('Pts', 'std'),
+        winner_points=('Pts', 'max'),
+        attendance=('Attendance', 'mean'),
+    )
+    return strength.reset_index()
+
+
+def league_churn(frame):
+    # Presence matrix of (Country, Squad) x Season; a team is promoted into a
+    # season when it is present there but absent the season before. The first
+    # season has nothing to compare against, so its promoted count is unknown.
+    present = pd.crosstab([frame['Country'], frame['Squad']], frame['Season']).astype(bool)
+    previous = present.shift(1, axis=1, fill_value=False)
+    promoted = (present & ~previous).groupby(level='Country').sum().iloc[:, 1:]
+    relegated = (frame['League_Status'] == 'Relegated').groupby([frame['Country'], frame['Season']]).sum()
+    churn = pd.DataFrame({
+        'promoted': promoted.stack(),
+        'relegated': relegated.reorder_levels(['Country', 'Season']),
+    })
+    churn['promoted'] = churn['promoted'].astype('Int64')
+    churn['relegated'] = churn['relegated'].fillna(0).astype(int)
+    return churn.reset_index()
+
+
+def build():
+    version = data_store.version()
+    frame = long_frame()
+    result = {
+        'version': version,
+        'frame': frame,
+        'trajectories': team_trajectories(frame),
+        'strength': league_strength(frame),
+        'churn': league_churn(frame),
+    }
+    with _lock:
+        _cache.clear()
+        _cache.update(result)
+    return result
+
+
+def invalidate(seasons=None):
+    with _lock:
+        _cache.clear()
+
+
+data_store.add_listener(invalidate)
+
+
+def _get(key):
+    cache = dict(_cache)
+    if cache.get('version') != data_store.version():
+        cache = build()
+    return cache[key]
+
+
+def all_teams():
+    return list(_get('trajectories').index)
+
+
+def team_trajectory(squad):
+    trajectories = _get('trajectories')
+    if squad not in trajectories.index:
+        return pd.DataFrame(columns=['Season'] + TRAJECTORY_COLUMNS)
+    row = trajectories.loc[squad].unstack(level=0)
+    return row.dropna(how='all').rename_axis('Season').reset_index()
+
+
+def strength_table():
+    return _get('strength')
+
+
+def churn_table():
+    return _get('churn')
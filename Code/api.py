@@ -0,0 +1,111 @@
+import os
+import json
+import hashlib
+import flask
+import data_store
+import views
+
+# Read-only JSON API served next to the dashboard. Responses reuse the
+# precomputed records from views.py and carry a strong ETag derived from the
+# data file fingerprint, so repeat fetches are answered with 304 before any
+# records are touched.
+
+MAX_AGE = int(os.environ.get('API_MAX_AGE', 300))
+
+api = flask.Blueprint('api', __name__, url_prefix='/api')
+
+
+def error(status, message):
+    response = flask.jsonify(error=message)
+    response.status_code = status
+    return response
+
+
+def requested_seasons():
+    season = flask.request.args.get('season')
+    if season is None:
+        return data_store.seasons()
+    if not season.isdigit() or int(season) not in data_store.seasons():
+        flask.abort(error(404, 'unknown season %s' % season))
+    return [int(season)]
+
+
+def cached_json(seasons, build):
+    fingerprint = ','.join(data_store.season_fingerprint(season) for season in seasons)
+    key = '%s?%s|%s' % (flask.request.path, flask.request.query_string.decode(), fingerprint)
+    etag = hashlib.sha1(key.encode()).hexdigest()
+    # compression.py strips and restores the content-coding suffix of the tag.
+    if flask.request.if_none_match.contains(etag):
+        response = flask.Response(status=304)
+        response.set_etag(etag)
+    else:
+        response = flask.Response(json.dumps(build(), ensure_ascii=False, default=str),
+                                  mimetype='application/json')
+        response.set_etag(etag)
+    response.headers['Cache-Control'] = 'public, max-age=%d' % MAX_AGE
+    return response
+
+
+def filtered(records, key, value):
+    if value is None:
+        return records
+    return [record for record in records if record[key] == value]
+
+
+def season_records(seasons, records):
+    return [dict(record, Season=season) for season in seasons for record in records(season)]
+
+
+@api.route('/seasons')
+def seasons():
+    return cached_json(data_store.seasons(), lambda: [
+        {'season': season, 'label': data_store.season_label(season)} for season in data_store.seasons()])
+
+
+@api.route('/league-table')
+def league_table():
+    seasons = requested_seasons()
+    country = flask.request.args.get('country')
+    leagues = [country] if country else views.LEAGUES
+    return cached_json(seasons, lambda: season_records(
+        seasons, lambda season: [dict(record, Country=league) for league in leagues
+                                 for record in views.league_records(season, league)]))
+
+
+@api.route('/winners')
+def winners():
+    seasons = requested_seasons()
+    country = flask.request.args.get('country')
+    return cached_json(seasons, lambda: season_records(
+        seasons, lambda season: filtered(views.winner_records(season), 'Country', country)))
+
+
+@api.route('/relegated')
+def relegated():
+    seasons = requested_seasons()
+    country = flask.request.args.get('country')
+    return cached_json(seasons, lambda: season_records(
+        seasons, lambda season: filtered(views.relegated_records(season), 'Country', country)))
+
+
+def team_records(seasons, country, squad):
+    frame = data_store.all_seasons_frame().loc[seasons]
+    if country:
+        frame = frame[frame['Country'] == country]
+    if squad:
+        frame = frame[frame['Squad'] == squad]
+    # Pts/G is held as float32; widen and round so clients see 1.61, not 1.6100000143.
+    frame = frame.assign(**{'Pts/G': frame['Pts/G'].astype('float64').round(2)})
+    return json.loads(frame.reset_index(level='Season').to_json(orient='records', force_ascii=False))
+
+
+@api.route('/teams')
+def teams():
+    seasons = requested_seasons()
+    country = flask.request.args.get('country')
+    squad = flask.request.args.get('squad')
+    return cached_json(seasons, lambda: team_records(seasons, country, squad))
+
+
+def init_app(server):
+    server.register_blueprint(api)
@@ -1,49 +1,54 @@
-import re
-import io
-import pandas as pd
+import os
+import functools
+import threading
 import dash
-import dash_table
 import dash_bootstrap_components as dbc
-import dash_core_components as dcc
-import matplotlib.pyplot as plt
-import dash_html_components as html
-from dash.dependencies import Input, Output
-import plotly.graph_objects as go
-import plotly.express as px
+from dash import dcc, html, dash_table
+from dash.dependencies import Input, Output, State, ClientsideFunction
+import data_store
+import views
+import figure_cache
+import analytics
+import compression
+import team_index
+import comparison
+import api
+import snapshots
+import background
+import single_flight
+import similarity
+import simulation
+from callback_registry import CallbackRegistry, timed
+from views import winning_team, relegated_teams
+
+# plotly.express and plotly.graph_objects are imported inside the figure
+# builders: they are the slowest imports in the app and most workers serve
+# cached figures without ever needing them.
 
 external_stylesheets = ['http://fonts.cdnfonts.com/css/verlag']
-buffer = io.StringIO()
-pd.options.plotting.backend = "plotly"
 
 
-def input2(input: int):
-    file = "./Teams_Stats/Big_5_" + str(input) + ".csv"
-    return pd.read_csv(file, parse_dates=True)
-
-def team_names_list(cL):
-    names = list(cL['Squad'])
-    return names
+# Plotly Express is not thread-safe: concurrent px calls in gthread workers can
+# fail with "Invalid value" errors, so every builder using it runs under one lock.
+_px_lock = threading.Lock()
 
-def league_table(pL, league):
-    league_team = pL[pL['Country'] == league]
-    league_team_names = league_team.sort_values(by='LgRk', ascending=True)
-    return league_team_names
 
-def all_teams_name(season):
-    df = input2(season)
-    all_names = df.sort_values(by=['Squad']).drop_duplicates(subset=['Squad'])
-    all_teams_name = list(all_names['Squad'])
-    return all_teams_name
+def serialized(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with _px_lock:
+            return func(*args, **kwargs)
+    return wrapper
 
-def winning_team(pL):
-    win_team = pL[pL["LgRk"] == 1].sort_values(by='Pts', ascending=False)
-    return win_team
 
-def relegated_teams(pL):
-    rel_team = pL[pL["League_Status"] == "Relegated"].sort_values(by='Pts', ascending=False)
-    return rel_team
+@timed('pandas')
+def input2(input: int):
+    return data_store.season_frame(input)
 
-def figures(pL):
+@timed('figure')
+@serialized
+def winners_figure(pL):
+    import plotly.express as px
     won = winning_team(pL)
     figure_1 = px.bar(won, x='Squad', y='Pts', color='Squad', text='Pts')
     figure_1.update_layout(
@@ -52,34 +57,86 @@ def figures(pL):
             color="darkblue"
         )
     )
+    return figure_1
+
+@timed('figure')
+@serialized
+def relegated_figure(pL):
+    import plotly.express as px
     rel = relegated_teams(pL)
     figure_2 = px.scatter(rel, x="Country", y="Pts", color='Country', size='Pts', hover_data=['Squad'])
+    return figure_2
+
+def season_figures(season):
+    season = int(season)
+    version = data_store.season_version(season)
+    figure_1 = figure_cache.cache.get((season, version, 'winners'), lambda: snapshots.load_figure(season, 'winners')
+                                      or winners_figure(input2(season)))
+    figure_2 = figure_cache.cache.get((season, version, 'relegated'), lambda: snapshots.load_figure(season, 'relegated')
+                                      or relegated_figure(input2(season)))
     return figure_1, figure_2
 
+@timed('figure')
 def polar_plot(pL, team):
-    stat_team = pL[pL["Squad"].isin(team)]
-    stats = stat_team.sort_values(by=['Squad'])
-    stats_list = stats[['MP', 'W', 'D', 'L', 'GF', 'GA', 'GD', 'Pts']].values.tolist()
-    Attribute = ["Matches Played", "Wins", "Draws", "Losses", "Goals For", "Goals Against", "Goal \nDifference",
-                 "Points"]
-    figure_3 = px.line_polar(line_close=True)
-    figure_3.update_layout(title="Team Stats", font_size=14, polar=dict(bgcolor="#F0F8FF", angularaxis=dict(
-        gridcolor='#40E0D0'
-    ), radialaxis=dict(gridcolor="#40E0D0", linecolor="#40E0D0")), font=dict(
-        family="'Verlag', sans-serif",
-        color="#003399",
-    ),
-                           paper_bgcolor="white")
-    team_name = sorted(team)
-    for i in range(0, len(stats_list)):
-        figure_3.add_trace(go.Scatterpolar(
-            r=stats_list[i],
-            theta=Attribute,
-            fill='toself',
-            name=team_name[i]
-        ))
-        i += 1
-    return figure_3
+    teams = sorted(team)
+    stats = pL[comparison.STATS].set_index(pL['Squad'].astype(str))
+    stats = stats[~stats.index.duplicated()].reindex(teams)
+    return comparison.polar_figure(stats.to_numpy(), teams)
+
+@timed('figure')
+@serialized
+def trajectory_figures(squad):
+    import plotly.express as px
+    trajectory = analytics.team_trajectory(squad)
+    trajectory['Season'] = trajectory['Season'].map(data_store.season_label)
+    figure_1 = px.line(trajectory, x='Season', y=['Pts', 'GD'], markers=True, title=squad)
+    figure_2 = px.line(trajectory, x='Season', y='LgRk', markers=True, title='League position')
+    figure_2.update_yaxes(autorange='reversed')
+    for figure in (figure_1, figure_2):
+        figure.update_layout(font=dict(family="'Verlag', sans-serif", color="#003399"))
+    return figure_1, figure_2
+
+@timed('figure')
+@serialized
+def strength_figure():
+    import plotly.express as px
+    strength = analytics.strength_table().copy()
+    strength['Season'] = strength['Season'].map(data_store.season_label)
+    figure = px.line(strength, x='Season', y='points_spread', color='Country', markers=True,
+                     title='Points spread (competitive balance)')
+    figure.update_layout(font=dict(family="'Verlag', sans-serif", color="#003399"))
+    return figure
+
+@timed('figure')
+@serialized
+def simulation_figure(positions, league, season):
+    import plotly.express as px
+    figure = px.imshow(positions, x=[str(c) for c in positions.columns], y=list(positions.index),
+                       color_continuous_scale='Blues', aspect='auto',
+                       labels=dict(x='Finishing position', y='', color='Probability'),
+                       title='%s %s: finishing positions' % (league, data_store.season_label(season)))
+    figure.update_layout(font=dict(family="'Verlag', sans-serif", color="#003399"), height=600)
+    return figure
+
+def simulation_view(season, league, runs, progress=None):
+    # Seeded per season and league, so the view is stable between reloads.
+    seed = int(season) * len(views.LEAGUES) + views.LEAGUES.index(league)
+    summary, positions = simulation.simulate_league(season, league, runs, seed, progress)
+    table = summary.round({'xPts': 1, 'Title': 3, 'Top 4': 3, 'Relegated': 3}).to_dict('records')
+    return simulation_figure(positions, league, season), table
+
+@timed('figure')
+def comparison_figure(teams, seasons, normalize):
+    return comparison.compare(sorted(teams), sorted(seasons), normalize)
+
+@timed('figure')
+def similar_figure(squad, season, other_leagues):
+    return similarity.polar_overlay(squad, season, other_leagues=other_leagues)[0]
+
+def season_polar_plot(season, team):
+    season = int(season)
+    key = (season, data_store.season_version(season), 'polar', tuple(sorted(team)))
+    return figure_cache.cache.get(key, lambda: polar_plot(input2(season), team))
 
 SIDEBAR_STYLE = {
     "position": "fixed",
@@ -98,6 +155,54 @@ CONTENT_STYLE = {
     "padding": "2rem 1rem",
 }
 
+# Team Stats help content. Every panel is rendered once with the layout and the
+# clientside callback in assets/style.js only toggles which one is visible.
+
+data_description = html.Div([
+    html.Ul([
+        html.Div([
+            html.Div([
+                html.Li(['Rk: Indicates the rank of the team in the Big 5 European League.']),
+                html.Li(['Squad: Name of the team.']),
+                html.Li(['Country: Name of the country the team represents.']),
+                html.Li(['LgRk: Position the team finished within the league.']),
+                html.Li(['MP: Total number of matches played.']),
+                html.Li(['W: Total wins.']),
+                html.Li(['D: Total draws.']),
+                html.Li(['L: Total loses.']),
+            ], className='attribute_2'),
+            html.Div([
+                html.Li(['GF: Goals for.']),
+                html.Li(['GA: Goals against.']),
+                html.Li(['GD: Goal difference.']),
+                html.Li(['Pts: Total points earned.']),
+                html.Li(['Pts/G: Points per game.']),
+                html.Li(['Attendance: Attendance per game during this season (only for home games).']),
+                html.Li([
+                            'Top Team Scorer: Name of the teams top scorer along with the number of goals scored (only for league games.']),
+                html.Li(['Goalkeeper: Name of the goalkeeper.']),
+            ], className='attribute_2')
+        ], style={'margin': '0 0em 0 -3.3em', 'display': 'grid', 'grid-column-gap': '1em',
+                  'padding': '0 0 0 0em', 'grid-template-columns': '14em 16em', 'text-align': 'justify',
+                  'text-justify': 'inter-word', 'list-style-type': 'none'}, className="attribute_list")
+    ], style={'transform': 'scale(0.82)'})
+])
+
+HELP_PANELS = [
+    ('default', "Team Stats information"),
+    ('intro_button', "The teams stats page consists of visualizations and tables about the data. Below is a description of the data-set and types of visualization you will come across."),
+    ('data_button', data_description),
+    ('league_button', "The league table shows the ranking of teams based on points at the end of the season. If you see the league table for other leagues, just click on the desired leagues button."),
+    ('winning_button', "This section shows the teams ranked first in their league and sorted by their points."),
+    ('relegated_button', "This section shows the teams that will be demoted to the league below and sorted by their points."),
+    ('polar_button', "This section shows a polar plot for stats for select teams. You can simply search for the team in the drop down and it will keep adding the stats for the selected teams in the same plot. If the team wasn’t present that season it will show a message 'One of the selected team was relegated'."),
+]
+
+help_panels = [
+    html.Div(text, id='help-' + key, style={'display': 'block' if key == 'default' else 'none'})
+    for key, text in HELP_PANELS
+]
+
 # Team Stats Description
 
 test_tab = html.Div([
@@ -116,121 +221,138 @@ test_tab = html.Div([
                 ], className="test_but"),
             ], className="cont_but_1"),
             html.Div([
-                html.Div([], id="test_button_output", className="test_output"),
+                html.Div(help_panels, id="test_button_output", className="test_output"),
             ], className="cont_but_2"),
         ], className="test_button_container")
     ])
 ])
 
-# Side Navigation Bar
+def season_options():
+    return [{'label': ' ' + data_store.season_label(season), 'value': season} for season in data_store.seasons()]
 
-sidebar = html.Div([
-    dbc.Nav([
-        html.Div([
-            dbc.NavLink("Home", href="/", active="exact", className="links",
-                        style={'text-decoration': 'none', 'color': '#002D72'}),
-            dbc.NavLink("Team Stats", href="/team-page", className='links', active="exact",
-                        style={'text-decoration': 'none', 'color': '#002D72'}),
-            # dbc.NavLink("Player Stats", href="/player-page", className='links', active="exact",
-            #             style={'text-decoration': 'none', 'color': '#002D72'}),
-            html.H4('Select Season', className='nav_link_season_title'),
+
+# Side navigation bar, rebuilt on every page load so newly ingested seasons show up
+# without restarting the worker.
+
+def sidebar():
+    return html.Div([
+        dbc.Nav([
             html.Div([
-                dcc.RadioItems(
-                    id='season-radio',
-                    options=[
-                        {'label': ' 2015/16', 'value': 0},
-                        {'label': ' 2016/17', 'value': 1},
-                        {'label': ' 2017/18', 'value': 2},
-                        {'label': ' 2018/19', 'value': 3},
-                        {'label': ' 2019/20', 'value': 4},
-                        {'label': ' 2020/21', 'value': 5}
-                    ],
-                    value=0,
-                    style={
-                        'margin': '1em 0 0 0',
-                        'display': 'grid',
-                        'grid-template-columns': 'auto auto',
-                        'grid-row-gap': '1em',
-                        'color': '#002D72',
-                        'font-size': '1.1em',
-                        'align-content': 'center'
-                    }
-                ),
-            ], className='season_values')
-        ], className='nav_links')
-    ], vertical=True, pills=True, className='nav-bar'),
-], style=SIDEBAR_STYLE, )
+                dbc.NavLink("Home", href="/", active="exact", className="links",
+                            style={'text-decoration': 'none', 'color': '#002D72'}),
+                dbc.NavLink("Team Stats", href="/team-page", className='links', active="exact",
+                            style={'text-decoration': 'none', 'color': '#002D72'}),
+                dbc.NavLink("Trends", href="/trends", className='links', active="exact",
+                            style={'text-decoration': 'none', 'color': '#002D72'}),
+                dbc.NavLink("Simulation", href="/simulation", className='links', active="exact",
+                            style={'text-decoration': 'none', 'color': '#002D72'}),
+                # dbc.NavLink("Player Stats", href="/player-page", className='links', active="exact",
+                #             style={'text-decoration': 'none', 'color': '#002D72'}),
+                html.H4('Select Season', className='nav_link_season_title'),
+                html.Div([
+                    dcc.RadioItems(
+                        id='season-radio',
+                        options=season_options(),
+                        value=(data_store.seasons() or [None])[0],
+                        style={
+                            'margin': '1em 0 0 0',
+                            'display': 'grid',
+                            'grid-template-columns': 'auto auto',
+                            'grid-row-gap': '1em',
+                            'color': '#002D72',
+                            'font-size': '1.1em',
+                            'align-content': 'center'
+                        }
+                    ),
+                ], className='season_values')
+            ], className='nav_links')
+        ], vertical=True, pills=True, className='nav-bar'),
+    ], style=SIDEBAR_STYLE, )
 
 content = html.Div(id="page-content", children=[], style=CONTENT_STYLE)
 
+data_store.load()
+views.build_all()
+analytics.build()
+similarity.index()
+
 app = dash.Dash(__name__, external_stylesheets=external_stylesheets, suppress_callback_exceptions=True)
 application = app.server
-app.layout = html.Div([
-    dcc.Location(id="url"),
-    sidebar,
-    content,
-])
+callbacks = CallbackRegistry(app)
+compression.init_app(application)
+api.init_app(application)
+snapshots.init_app(application)
 
 
-@app.callback(Output('test_button_output', 'children'),
-              dash.dependencies.Input('intro_button', 'n_clicks'),
-              dash.dependencies.Input('data_button', 'n_clicks'),
-              Input('league_button', 'n_clicks'),
-              Input('winning_button', 'n_clicks'),
-              Input('relegated_button', 'n_clicks'),
-              Input('polar_button', 'n_clicks'))
-def displayClick(btn1, btn2, btn3, btn4, btn5, btn6):
-    changed_id = [p['prop_id'] for p in dash.callback_context.triggered][0]
-    if 'intro_button' in changed_id:
-        return "The teams stats page consists of visualizations and tables about the data. Below is a description of the data-set and types of visualization you will come across."
-    elif 'data_button' in changed_id:
-        return html.Div([
-            html.Ul([
-                html.Div([
-                    html.Div([
-                        html.Li(['Rk: Indicates the rank of the team in the Big 5 European League.']),
-                        html.Li(['Squad: Name of the team.']),
-                        html.Li(['Country: Name of the country the team represents.']),
-                        html.Li(['LgRk: Position the team finished within the league.']),
-                        html.Li(['MP: Total number of matches played.']),
-                        html.Li(['W: Total wins.']),
-                        html.Li(['D: Total draws.']),
-                        html.Li(['L: Total loses.']),
-                    ], className='attribute_2'),
-                    html.Div([
-                        html.Li(['GF: Goals for.']),
-                        html.Li(['GA: Goals against.']),
-                        html.Li(['GD: Goal difference.']),
-                        html.Li(['Pts: Total points earned.']),
-                        html.Li(['Pts/G: Points per game.']),
-                        html.Li(['Attendance: Attendance per game during this season (only for home games).']),
-                        html.Li([
-                                    'Top Team Scorer: Name of the teams top scorer along with the number of goals scored (only for league games.']),
-                        html.Li(['Goalkeeper: Name of the goalkeeper.']),
-                    ], className='attribute_2')
-                ], style={'margin': '0 0em 0 -3.3em', 'display': 'grid', 'grid-column-gap': '1em',
-                          'padding': '0 0 0 0em', 'grid-template-columns': '14em 16em', 'text-align': 'justify',
-                          'text-justify': 'inter-word', 'list-style-type': 'none'}, className="attribute_list")
-            ], style={'transform': 'scale(0.82)'})
-        ])
-    elif 'league_button' in changed_id:
-        return "The league table shows the ranking of teams based on points at the end of the season. If you see the league table for other leagues, just click on the desired leagues button."
-    elif 'winning_button' in changed_id:
-        return "This section shows the teams ranked first in their league and sorted by their points."
-    elif 'relegated_button' in changed_id:
-        return "This section shows the teams that will be demoted to the league below and sorted by their points."
-    elif 'polar_button' in changed_id:
-        return "This section shows a polar plot for stats for select teams. You can simply search for the team in the drop down and it will keep adding the stats for the selected teams in the same plot. If the team wasn’t present that season it will show a message 'One of the selected team was relegated'."
-    else:
-        return "Team Stats information"
+def figure_cache_metrics():
+    stats = figure_cache.cache.stats()
+    lines = []
+    for key in ('hits', 'misses'):
+        lines.append('# TYPE figure_cache_%s_total counter' % key)
+        lines.append('figure_cache_%s_total %d' % (key, stats[key]))
+    lines.append('# TYPE figure_cache_entries gauge')
+    lines.append('figure_cache_entries %d' % stats['size'])
+    return lines
 
 
-@app.callback(
+def single_flight_metrics():
+    stats = single_flight.group.stats()
+    return ['# TYPE single_flight_calls_total counter',
+            'single_flight_calls_total %d' % stats['calls'],
+            '# TYPE single_flight_coalesced_total counter',
+            'single_flight_coalesced_total %d' % stats['coalesced'],
+            '# TYPE single_flight_inflight gauge',
+            'single_flight_inflight %d' % stats['inflight']]
+
+
+callbacks.add_collector(figure_cache_metrics)
+callbacks.add_collector(single_flight_metrics)
+
+
+def season_memory_metrics():
+    report = data_store.memory_report()
+    lines = ['# TYPE season_frame_bytes gauge']
+    lines.extend('season_frame_bytes{season="%s"} %d' % (season, row['bytes'])
+                 for season, row in report.iterrows() if isinstance(season, int))
+    lines.append('# TYPE season_store_bytes gauge')
+    lines.append('season_store_bytes %d' % report.loc['seasons total', 'bytes'])
+    return lines
+
+
+callbacks.add_collector(season_memory_metrics)
+
+
+def data_quality_metrics():
+    counts = data_store.quality_report().groupby(['check', 'severity']).size()
+    lines = ['# TYPE data_quality_findings gauge']
+    lines.extend('data_quality_findings{check="%s",severity="%s"} %d' % (check, severity, count)
+                 for (check, severity), count in counts.items())
+    return lines
+
+
+callbacks.add_collector(data_quality_metrics)
+
+
+def serve_layout():
+    return html.Div([
+        dcc.Location(id="url"),
+        dcc.Store(id='data-version', data=data_store.data_fingerprint()),
+        dcc.Store(id='season-cache', storage_type='local'),
+        dcc.Store(id='season-request'),
+        dcc.Store(id='season-fetched'),
+        sidebar(),
+        content,
+    ])
+
+
+app.layout = serve_layout
+
+
+@callbacks.callback(
     Output("page-content", "children"),
-    [Input("url", "pathname"),
-     dash.dependencies.Input('season-radio', 'value')]
+    [Input("url", "pathname")]
 )
-def render_page_content(pathname, season):
+def render_page_content(pathname):
     if pathname == "/":
         return [
             html.H1(['Big 5 European Leagues'], className='page-title'),
@@ -248,7 +370,17 @@ def render_page_content(pathname, season):
     elif pathname == "/team-page":
         return [
             html.H1(['Big 5 European Leagues'], style={'font-style': 'normal'}, className='page-title'),
-            html.Div(id='slider-output-container', className="slider-container"),
+            html.Div(team_page(), id='slider-output-container', className="slider-container"),
+        ]
+    elif pathname == "/trends":
+        return [
+            html.H1(['Big 5 European Leagues'], style={'font-style': 'normal'}, className='page-title'),
+            trends_page(),
+        ]
+    elif pathname == "/simulation":
+        return [
+            html.H1(['Big 5 European Leagues'], style={'font-style': 'normal'}, className='page-title'),
+            simulation_page(),
         ]
 
 
@@ -256,103 +388,257 @@ def render_page_content(pathname, season):
 
 
 
-@app.callback(Output('container-button-timestamp', 'children'),
-              dash.dependencies.Input('season-radio', 'value'),
-              Input('prem-btn', 'value'),
-              Input('ligue-btn', 'value'),
-              Input('laliga-btn', 'value'),
-              Input('bundesliga-btn', 'value'),
-              Input('serie-a-btn', 'value'),
-              Input('prem-btn', 'n_clicks'),
-              Input('ligue-btn', 'n_clicks'),
-              Input('laliga-btn', 'n_clicks'),
-              Input('bundesliga-btn', 'n_clicks'),
-              Input('serie-a-btn', 'n_clicks'))
-def displayClick(season, eng, fre, esp, ger, ita, btn1, btn2, btn3, btn4, btn5):
-    changed_id = [p['prop_id'] for p in dash.callback_context.triggered][0]
-    if 'prem-btn' in changed_id:
-        league = eng
-    elif 'ligue-btn' in changed_id:
-        league = fre
-    elif 'laliga-btn' in changed_id:
-        league = esp
-    elif 'bundesliga-btn' in changed_id:
-        league = ger
-    elif 'serie-a-btn' in changed_id:
-        league = ita
-    else:
-        league = eng
-    pL = input2(season)
-    league_teams = league_table(pL, league)
+def simulation_page():
     return html.Div([
-        dash_table.DataTable(
-            id='table',
-            columns=[{"name": i, "id": i} for i in
-                     league_teams[['LgRk', 'Squad', 'MP', 'W', 'D', 'L', 'GF', 'GA', 'GD', 'Pts']].columns],
-            data=league_teams[['LgRk', 'Squad', 'MP', 'W', 'D', 'L', 'GF', 'GA', 'GD', 'Pts']].to_dict('records'),
-            fixed_rows={'headers': True},
-            style_data_conditional=[
-                {
-                    'if': {'row_index': 'odd'},
-                    'backgroundColor': '#1877F2',
-                    'color': 'white'
-                },
-                {
-                    'if': {'row_index': 'even'},
-                    'backgroundColor': '#1877F2',
-                    'color': 'white'
-                }
-            ],
-            style_cell={'padding': '5px'},
-            style_cell_conditional=[
-                {'if': {'column_id': 'LgRk'},
-                 'width': '5em'},
-            ],
-            style_data={
-                'font-family': '"Verlag", sans-serif',
-                'text-align': 'center',
-                'font-size': '12px',
-                'padding': '10px',
-            },
-            style_table={
-                'overflowX': 'auto',
-                'overflowY': 'auto',
-                'width': '35em',
-                'height': '40em',
-            },
-            style_header={
-                'padding': '10px',
-                'font-family': '"Verlag", sans-serif',
-                'backgroundColor': '#002D72',
-                'color': 'white',
-                'text-align': 'center',
-                'font-size': '15px'
-            }),
-    ], className='sub_layer_table', style={'margin': '3em 0 0 0', "position": "static"})
-
-
-@app.callback(
-    Output('dd-output-container', 'children'),
-    Input('demo-dropdown', 'value'),
-    dash.dependencies.Input('season-radio', 'value'))
-def update_output(team, season):
-    pL = input2(season)
-    team_name = team_names_list(pL)
-    polar = polar_plot(pL, team)
-    if set(team).issubset(set(team_name)):
-        return html.Div([dcc.Graph(id="graph", figure=polar)], style={'margin': '0em 0 0 0', 'width': '40em'}),
+        html.Div(['Season simulation'], style={'text-align': 'center'}, className='sub_layer_title_1'),
+        html.Div(["Each team's attack and defence are rated from its goals for and against per game. The "
+                  "season is then replayed thousands of times with Poisson-distributed scores for every "
+                  "home and away fixture."]),
+        dcc.RadioItems(
+            id='simulation-league-radio',
+            options=[{'label': ' ' + league, 'value': league} for league in views.LEAGUES],
+            value='ENG',
+            inline=True),
+        dcc.RadioItems(
+            id='simulation-runs-radio',
+            options=[{'label': ' %d runs' % runs, 'value': runs} for runs in (1000, 10000)],
+            value=1000,
+            inline=True),
+        html.Progress(id='simulation-progress', value='0', max='1', style={'visibility': 'hidden'}),
+        dcc.Graph(id='simulation-graph'),
+        html.Div([
+            dash_table.DataTable(
+                id='simulation-table',
+                columns=views.table_columns(['Squad', 'LgRk', 'Pts', 'xPts', 'Title', 'Top 4', 'Relegated']),
+                style_table={'width': '40em'}),
+        ], className='big5_table'),
+    ], className='trends_container')
+
+
+def trends_page():
+    churn = analytics.churn_table().copy()
+    churn['Season'] = churn['Season'].map(data_store.season_label)
+    strength = figure_cache.cache.get(('trends', data_store.version(), 'strength'), strength_figure)
+    return html.Div([
+        html.Div(['Team across seasons'], style={'text-align': 'center'}, className='sub_layer_title_1'),
+        dcc.Dropdown(
+            id='trend-team-dropdown',
+            options=[{'label': i, 'value': i} for i in analytics.all_teams()],
+            value='Arsenal',
+            style={'width': '30em', 'color': '#003399'}),
+        html.Div([
+            dcc.Graph(id='trend-points-graph'),
+            dcc.Graph(id='trend-rank-graph'),
+        ], className='trends_graphs'),
+        html.Progress(id='trend-progress', value='0', max='2', style={'visibility': 'hidden'}),
+        html.Div(['Compare teams across seasons'], style={'text-align': 'center'}, className='sub_layer_title_1'),
+        dcc.Dropdown(
+            id='compare-team-dropdown',
+            options=[{'label': i, 'value': i} for i in analytics.all_teams()],
+            value=['Arsenal', 'Chelsea'],
+            multi=True,
+            style={'width': '40em', 'color': '#003399'}),
+        dcc.Checklist(
+            id='compare-season-checklist',
+            options=season_options(),
+            value=data_store.seasons()[-1:],
+            inline=True),
+        dcc.RadioItems(
+            id='compare-normalize-radio',
+            options=[{'label': ' Totals', 'value': 'none'},
+                     {'label': ' Per game', 'value': 'per_game'},
+                     {'label': ' League z-score', 'value': 'zscore'}],
+            value='none',
+            inline=True),
+        html.Progress(id='compare-progress', value='0', max='2', style={'visibility': 'hidden'}),
+        dcc.Graph(id='compare-graph'),
+        html.Div(['Most similar team seasons'], style={'text-align': 'center'}, className='sub_layer_title_1'),
+        dcc.Dropdown(
+            id='similar-team-dropdown',
+            options=[{'label': i, 'value': i} for i in analytics.all_teams()],
+            value='Arsenal',
+            style={'width': '30em', 'color': '#003399'}),
+        dcc.Dropdown(
+            id='similar-season-dropdown',
+            options=season_options(),
+            value=(data_store.seasons() or [None])[-1],
+            clearable=False,
+            style={'width': '10em', 'color': '#003399'}),
+        dcc.RadioItems(
+            id='similar-scope-radio',
+            options=[{'label': ' All leagues', 'value': 'all'},
+                     {'label': ' Other leagues only', 'value': 'other'}],
+            value='all',
+            inline=True),
+        html.Div(id='similar-message'),
+        dcc.Graph(id='similar-graph'),
+        html.Div([
+            dash_table.DataTable(
+                id='similar-table',
+                columns=views.table_columns(['Squad', 'Season', 'Country', 'Distance']),
+                style_table={'width': '30em'}),
+        ], className='big5_table'),
+        html.Div(['League strength'], style={'text-align': 'center'}, className='sub_layer_title_1'),
+        dcc.Graph(id='trend-strength-graph', figure=strength),
+        html.Div(['Promotion and relegation churn'], style={'text-align': 'center'}, className='sub_layer_title_1'),
+        html.Div([
+            dash_table.DataTable(
+                id='trend-churn-table',
+                columns=views.table_columns(['Season', 'Country', 'promoted', 'relegated']),
+                data=churn.to_dict('records'),
+                style_table={'width': '30em'}),
+        ], className='big5_table'),
+    ], className='trends_container')
+
+
+# Trends jobs do not depend on the season, so they are only cancelled when the
+# user leaves the page; the season-dependent simulation is superseded by Dash
+# itself whenever season-radio re-triggers it.
+
+@callbacks.background_callback(
+    Output('trend-points-graph', 'figure'),
+    Output('trend-rank-graph', 'figure'),
+    Input('trend-team-dropdown', 'value'),
+    progress=[Output('trend-progress', 'value'), Output('trend-progress', 'max')],
+    cancel=[Input('url', 'pathname')],
+    running=[(Output('trend-progress', 'style'), {'visibility': 'visible'}, {'visibility': 'hidden'})])
+def update_trends(set_progress, squad):
+    if not squad:
+        return {}, {}
+    set_progress(('1', '2'))
+    key = 'trends:%s:%s' % (data_store.data_fingerprint(), squad)
+    return background.single_flight(key, lambda: trajectory_figures(squad))
+
+
+@callbacks.background_callback(
+    Output('compare-graph', 'figure'),
+    Input('compare-team-dropdown', 'value'),
+    Input('compare-season-checklist', 'value'),
+    Input('compare-normalize-radio', 'value'),
+    progress=[Output('compare-progress', 'value'), Output('compare-progress', 'max')],
+    cancel=[Input('url', 'pathname')],
+    running=[(Output('compare-progress', 'style'), {'visibility': 'visible'}, {'visibility': 'hidden'})])
+def update_comparison(set_progress, teams, seasons, normalize):
+    if not teams or not seasons:
+        return {}
+    set_progress(('1', '2'))
+    normalize = None if normalize == 'none' else normalize
+    key = ('trends', data_store.version(), 'compare', tuple(sorted(teams)), tuple(sorted(seasons)), normalize)
+    flight = 'compare:%s:%s:%s:%s' % (data_store.data_fingerprint(), ','.join(key[3]), ','.join(map(str, key[4])),
+                                      normalize)
+    return background.single_flight(
+        flight, lambda: figure_cache.cache.get(key, lambda: comparison_figure(teams, seasons, normalize)))
+
+
+@callbacks.background_callback(
+    Output('simulation-graph', 'figure'),
+    Output('simulation-table', 'data'),
+    Input('season-radio', 'value'),
+    Input('simulation-league-radio', 'value'),
+    Input('simulation-runs-radio', 'value'),
+    progress=[Output('simulation-progress', 'value'), Output('simulation-progress', 'max')],
+    cancel=[Input('url', 'pathname')],
+    running=[(Output('simulation-progress', 'style'), {'visibility': 'visible'}, {'visibility': 'hidden'})])
+def update_simulation(set_progress, season, league, runs):
+    if season is None or not league:
+        return {}, []
+    if league not in views.season_views(season)['league']:
+        return {}, []
+    key = 'simulation:%s:%s:%s' % (data_store.season_fingerprint(season), league, runs)
+    return background.single_flight(
+        key, lambda: simulation_view(season, league, runs, lambda done, total: set_progress((str(done), str(total)))))
+
+
+@callbacks.callback(
+    Output('similar-graph', 'figure'),
+    Output('similar-table', 'data'),
+    Output('similar-message', 'children'),
+    Input('similar-team-dropdown', 'value'),
+    Input('similar-season-dropdown', 'value'),
+    Input('similar-scope-radio', 'value'))
+def update_similar(squad, season, scope):
+    if not squad or season is None:
+        return {}, [], None
+    other_leagues = scope == 'other'
+    neighbours = similarity.nearest(squad, season, other_leagues=other_leagues)
+    if not neighbours:
+        return {}, [], '%s did not play in the Big 5 in %s' % (squad, data_store.season_label(season))
+    key = ('trends', data_store.version(), 'similar', squad, int(season), other_leagues)
+    figure = figure_cache.cache.get(key, lambda: similar_figure(squad, season, other_leagues))
+    table = [{'Squad': n['Squad'], 'Season': data_store.season_label(n['Season']), 'Country': n['Country'],
+              'Distance': round(n['distance'], 3)} for n in neighbours]
+    return figure, table, None
+
+
+app.clientside_callback(
+    ClientsideFunction(namespace='clientside', function_name='helpPanel'),
+    [Output('help-' + key, 'style') for key, text in HELP_PANELS],
+    Input('intro_button', 'n_clicks'),
+    Input('data_button', 'n_clicks'),
+    Input('league_button', 'n_clicks'),
+    Input('winning_button', 'n_clicks'),
+    Input('relegated_button', 'n_clicks'),
+    Input('polar_button', 'n_clicks'))
+
+
+# League switching runs in the browser against the season's five league tables,
+# which are preloaded into 'league-tables-store' with the team page.
+
+app.clientside_callback(
+    ClientsideFunction(namespace='clientside', function_name='leagueTable'),
+    Output('league-table', 'data'),
+    Input('league-tables-store', 'data'),
+    Input('prem-btn', 'n_clicks'),
+    Input('ligue-btn', 'n_clicks'),
+    Input('laliga-btn', 'n_clicks'),
+    Input('bundesliga-btn', 'n_clicks'),
+    Input('serie-a-btn', 'n_clicks'))
+
+
+def league_table_section():
+    return html.Div([
+        dcc.Store(id='league-tables-store'),
+        html.Div([
+            dash_table.DataTable(
+                id='league-table',
+                columns=views.table_columns(views.LEAGUE_COLUMNS),
+                data=[],
+                fixed_rows={'headers': True},
+                style_cell_conditional=[
+                    {'if': {'column_id': 'LgRk'},
+                     'width': '5em'},
+                ],
+                style_table={
+                    'overflowX': 'auto',
+                    'overflowY': 'auto',
+                    'width': '35em',
+                    'height': '40em',
+                }),
+        ], className='sub_layer_table big5_table', style={'margin': '3em 0 0 0', "position": "static"}),
+    ])
+
+
+@callbacks.callback(
+    Output('polar-graph', 'figure'),
+    Output('polar-graph-container', 'style'),
+    Output('polar-message', 'children'),
+    Input('polar-request', 'data'),
+    prevent_initial_call=True)
+def update_polar_chart(request):
+    team, season = request['teams'], request['season']
+    if team_index.index().contains(season, team):
+        polar = season_polar_plot(season, team)
+        return polar, {'margin': '0em 0 0 0', 'width': '40em'}, None
     else:
-        return "One of the selected team was relegated"
+        return dash.no_update, {'display': 'none'}, "One of the selected team was relegated"
 
-@app.callback(
-    dash.dependencies.Output('slider-output-container', 'children'),
-    [dash.dependencies.Input('season-radio', 'value')])
-def update_output(value):
-    pL = input2(value)
-    won = winning_team(pL)
-    relegated = relegated_teams(pL)
-    all_teams = all_teams_name(value)
-    fig3, fig4 = figures(pL)
+# Team page. The layout below is static and is filled from the browser's season
+# cache: a season bundle (tables, team list and both season figures) is fetched
+# once through fetch_season_bundle, kept in the 'season-cache' local store and
+# tagged with the server's data fingerprint. Toggling back to a cached season
+# renders entirely clientside; a new fingerprint drops the whole cache.
+
+def team_page():
     return html.Div([
         html.Div(['League Table'], style={'text-align': 'center'}, className='sub_layer_1 sub_layer_title_1'),
         html.Div([
@@ -389,85 +675,38 @@ def update_output(value):
                                   value="ITA", className="btn5")
                       ], className='flex-buttons')
         ], style={'margin': "5em 0 0 0em"}, className='sub_layer_2'),
-        html.Div(id='container-button-timestamp', className='sub_layer_3', style={'margin': '0 0em 0 -8em'}),
+        html.Div(league_table_section(), id='container-button-timestamp', className='sub_layer_3',
+                 style={'margin': '0 0em 0 -8em'}),
         html.Div(['Winning teams from each league'], style={'text-align': 'center'},
                  className='sub_layer_4 sub_layer_title_2'),
         html.Div([
             dash_table.DataTable(
-                id='table',
-                columns=[{"name": i, "id": i} for i in
-                         won[["Squad", "Pts", "Country", "Top Team Scorer", "Goalkeeper"]].columns],
-                data=won[["Squad", "Pts", "Country", "Top Team Scorer", "Goalkeeper"]].to_dict('records'),
+                id='winners-table',
+                columns=views.table_columns(views.SUMMARY_COLUMNS),
+                data=[],
                 fixed_rows={'headers': True},
-                style_data_conditional=[
-                    {
-                        'if': {'row_index': 'odd'},
-                        'backgroundColor': '#1877F2',
-                        'color': 'white'
-                    },
-                    {
-                        'if': {'row_index': 'even'},
-                        'backgroundColor': '#1877F2',
-                        'color': 'white'
-                    }
-                ],
-                style_cell={'padding': '5px'},
                 style_cell_conditional=[
                     {'if': {'column_id': 'Country'},
                      'width': '6em'},
                     {'if': {'column_id': 'Pts'},
                      'width': '4em'},
                 ],
-                style_data={
-                    'font-family': '"Verlag", sans-serif',
-                    'text-align': 'center',
-                    'font-size': '12px',
-                    'padding': '10px',
-                },
                 style_table={
                     'overflowX': 'auto',
                     'overflowY': 'auto',
                     'width': '30em'
-                },
-                style_header={
-                    'padding': '10px',
-                    'font-family': '"Verlag", sans-serif',
-                    'backgroundColor': '#002D72',
-                    'color': 'white',
-                    'text-align': 'center',
-                    'font-size': '15px'
                 }),
-        ], className='sub_layer_5 sub_layer_table', style={'margin': '6em 0 0 0'}),
-        html.Div([dcc.Graph(id="graph", figure=fig3)], style={'margin': '0 0 0 0', 'width': '30em', 'height': '10em'},
+        ], className='sub_layer_5 sub_layer_table big5_table', style={'margin': '6em 0 0 0'}),
+        html.Div([dcc.Graph(id="winners-graph")], style={'margin': '0 0 0 0', 'width': '30em', 'height': '10em'},
                  className='sub_layer_6 sub_layer_graph'),
         html.Div(['Relegated teams from each league'], style={'text-align': 'center'},
                  className='sub_layer_7 sub_layer_title_3'),
         html.Div([
             dash_table.DataTable(
-                id='table',
-                columns=[{"name": i, "id": i} for i in
-                         relegated[["Squad", "Pts", "Country", "Top Team Scorer", "Goalkeeper"]].columns],
-                data=relegated[["Squad", "Pts", "Country", "Top Team Scorer", "Goalkeeper"]].to_dict('records'),
+                id='relegated-table',
+                columns=views.table_columns(views.SUMMARY_COLUMNS),
+                data=[],
                 fixed_rows={'headers': True},
-                style_data_conditional=[
-                    {
-                        'if': {'row_index': 'odd'},
-                        'backgroundColor': '#1877F2',
-                        'color': 'white'
-                    },
-                    {
-                        'if': {'row_index': 'even'},
-                        'backgroundColor': '#1877F2',
-                        'color': 'white'
-                    }
-                ],
-                style_cell={'padding': '5px'},
-                style_data={
-                    'font-family': '"Verlag", sans-serif',
-                    'text-align': 'center',
-                    'font-size': '12px',
-                    'padding': '10px',
-                },
                 style_cell_conditional=[
                     {'if': {'column_id': 'Pts'},
                      'width': '4em'},
@@ -480,130 +719,157 @@ def update_output(value):
                     'overflowY': 'auto',
                     'width': '30em',
                     'height': '30em',
-                },
-                style_header={
-                    'padding': '10px',
-                    'font-family': '"Verlag", sans-serif',
-                    'backgroundColor': '#002D72',
-                    'color': 'white',
-                    'text-align': 'center',
-                    'font-size': '15px'
                 }),
-        ], className='sub_layer_8 sub_layer_table', style={'margin': '3em 0 0 0'}),
-        html.Div([dcc.Graph(id="graph", figure=fig4)], style={'margin': '4em 0 0 0', 'width': '30em'},
+        ], className='sub_layer_8 sub_layer_table big5_table', style={'margin': '3em 0 0 0'}),
+        html.Div([dcc.Graph(id="relegated-graph")], style={'margin': '4em 0 0 0', 'width': '30em'},
                  className='sub_layer_9 sub_layer_graph'),
         html.Div(['Polar plot to display season wise stats for teams in the Big 5 League'],
                  style={'text-align': 'center'}, className='sub_layer_10 sub_layer_title_4'),
         html.Div([
+            dcc.Store(id='polar-request'),
             dcc.Dropdown(
                 id='demo-dropdown',
-                options=[
-                    {'label': i, 'value': i} for i in all_teams
-                ],
+                options=[],
                 value=[],
                 multi=True
                 , style={
                     'width': '40em',
                     'color': '#003399',
-                }), html.Div(id='dd-output-container', style={'position': 'relative'})
+                }), html.Div([
+                html.Div([dcc.Graph(id="polar-graph")], id='polar-graph-container',
+                         style={'margin': '0em 0 0 0', 'width': '40em'}),
+                html.Div(id='polar-message'),
+            ], id='dd-output-container', style={'position': 'relative'})
         ], className='sub_layer_11 sub_layer_polar'),
-    ], className='container'),
+    ], className='container')
+
+
+def season_bundle(season):
+    fig3, fig4 = season_figures(season)
+    return {
+        'league': views.season_views(season)['league'],
+        'winners': views.winner_records(season),
+        'relegated': views.relegated_records(season),
+        'teams': views.team_names(season),
+        'figures': {'winners': fig3, 'relegated': fig4},
+    }
+
+
+@callbacks.callback(
+    Output('season-fetched', 'data'),
+    Input('season-request', 'data'),
+    prevent_initial_call=True)
+def fetch_season_bundle(request):
+    season = int(request['season'])
+    return {'version': data_store.data_fingerprint(), 'season': season, 'bundle': season_bundle(season)}
 
 
-@app.callback(
+app.clientside_callback(
+    ClientsideFunction(namespace='clientside', function_name='seasonRequest'),
+    Output('season-request', 'data'),
+    Input('season-radio', 'value'),
+    Input('data-version', 'data'),
+    State('season-cache', 'data'))
+
+app.clientside_callback(
+    ClientsideFunction(namespace='clientside', function_name='storeSeason'),
+    Output('season-cache', 'data'),
+    Output('data-version', 'data'),
+    Input('season-fetched', 'data'),
+    State('season-cache', 'data'),
+    prevent_initial_call=True)
+
+app.clientside_callback(
+    ClientsideFunction(namespace='clientside', function_name='renderSeason'),
+    Output('league-tables-store', 'data'),
+    Output('winners-table', 'data'),
+    Output('relegated-table', 'data'),
+    Output('winners-graph', 'figure'),
+    Output('relegated-graph', 'figure'),
+    Input('season-radio', 'value'),
+    Input('season-cache', 'data'),
+    State('data-version', 'data'))
+
+app.clientside_callback(
+    ClientsideFunction(namespace='clientside', function_name='teamOptions'),
+    Output('demo-dropdown', 'options', allow_duplicate=True),
+    Input('season-radio', 'value'),
+    Input('season-cache', 'data'),
+    State('data-version', 'data'),
+    State('demo-dropdown', 'value'),
+    prevent_initial_call=True)
+
+app.clientside_callback(
+    ClientsideFunction(namespace='clientside', function_name='polarRequest'),
+    Output('polar-request', 'data'),
+    Input('demo-dropdown', 'value'),
+    Input('season-radio', 'value'),
+    State('polar-request', 'data'))
+
+# The polar dropdown is searched on the server against the team index, which
+# covers every season and folds accents and common alternate names. The
+# 'search' key lets the dropdown's own client filter keep alias matches.
+
+@callbacks.callback(
+    Output('demo-dropdown', 'options'),
+    Input('demo-dropdown', 'search_value'),
+    State('season-radio', 'value'),
+    State('demo-dropdown', 'value'))
+def search_teams(search_value, season, selected):
+    selected = selected or []
+    if search_value:
+        names = team_index.search(search_value)
+    else:
+        names = team_index.index().season_teams(season)
+    names = selected + [name for name in names if name not in selected]
+    return [{'label': i, 'value': i, 'search': '%s %s' % (search_value or '', i)} for i in names]
+
+
+@callbacks.callback(
     dash.dependencies.Output('container-button-basic', 'children'),
     Input('season-radio', 'value'),
     dash.dependencies.Input('submit-val', 'value'),
     dash.dependencies.Input('submit-val-2', 'value'),
     dash.dependencies.Input('submit-val', 'n_clicks'),
     dash.dependencies.Input('submit-val-2', 'n_clicks'))
-def update_output(season, league_1, league_2, league_btn_1, league_btn_2):
-    pL = input2(season)
+def update_league_comparison(season, league_1, league_2, league_btn_1, league_btn_2):
     changed_id = [p['prop_id'] for p in dash.callback_context.triggered][0]
     if 'submit-val' in changed_id:
-        league_teams = league_table(pL, league_1)
         return html.Div([
             dash_table.DataTable(
-                id='table',
-                columns=[{"name": i, "id": i} for i in
-                         league_teams[['LgRk', 'Squad', 'MP', 'W', 'D', 'L', 'GF', 'GA', 'GD', 'Pts']].columns],
-                data=league_teams[['LgRk', 'Squad', 'MP', 'W', 'D', 'L', 'GF', 'GA', 'GD', 'Pts']].to_dict('records'),
-                style_data_conditional=[
-                    {
-                        'if': {'row_index': 'odd'},
-                        'backgroundColor': '#1877F2',
-                        'color': 'white'
-                    },
-                    {
-                        'if': {'row_index': 'even'},
-                        'backgroundColor': '#1877F2',
-                        'color': 'white'
-                    }
-                ],
-                style_cell={'padding': '5px'},
-                style_data={
-                    'font-family': '"Verlag", sans-serif',
-                    'text-align': 'center',
-                    'font-size': '12px',
-                    'padding': '10px',
-                },
+                id='comparison-table',
+                columns=views.table_columns(views.LEAGUE_COLUMNS),
+                data=views.league_records(season, league_1),
                 style_table={
                     'overflowX': 'auto',
                     'width': '30em'
 
-                },
-                style_header={
-                    'padding': '10px',
-                    'font-family': '"Verlag", sans-serif',
-                    'backgroundColor': '#002D72',
-                    'color': 'white',
-                    'text-align': 'center',
-                    'font-size': '15px'
                 }),
-        ], className='sub_layer_5 sub_layer_table', style={'margin': '3em 0 0 0'})
+        ], className='sub_layer_5 sub_layer_table big5_table', style={'margin': '3em 0 0 0'})
     elif 'submit-val-2' in changed_id:
-        league_teams = league_table(pL, league_2)
         return html.Div([
             dash_table.DataTable(
-                id='table',
-                columns=[{"name": i, "id": i} for i in
-                         league_teams[['LgRk', 'Squad', 'MP', 'W', 'D', 'L', 'GF', 'GA', 'GD', 'Pts']].columns],
-                data=league_teams[['LgRk', 'Squad', 'MP', 'W', 'D', 'L', 'GF', 'GA', 'GD', 'Pts']].to_dict('records'),
-                style_data_conditional=[
-                    {
-                        'if': {'row_index': 'odd'},
-                        'backgroundColor': '#1877F2',
-                        'color': 'white'
-                    },
-                    {
-                        'if': {'row_index': 'even'},
-                        'backgroundColor': '#1877F2',
-                        'color': 'white'
-                    }
-                ],
-                style_cell={'padding': '5px'},
-                style_data={
-                    'font-family': '"Verlag", sans-serif',
-                    'text-align': 'center',
-                    'font-size': '12px',
-                    'padding': '10px',
-                },
+                id='comparison-table',
+                columns=views.table_columns(views.LEAGUE_COLUMNS),
+                data=views.league_records(season, league_2),
                 style_table={
                     'overflowX': 'auto',
                     'width': '30em'
 
-                },
-                style_header={
-                    'padding': '10px',
-                    'font-family': '"Verlag", sans-serif',
-                    'backgroundColor': '#002D72',
-                    'color': 'white',
-                    'text-align': 'center',
-                    'font-size': '15px'
                 }),
-        ], className='sub_layer_5 sub_layer_table', style={'margin': '3em 0 0 0'})
+        ], className='sub_layer_5 sub_layer_table big5_table', style={'margin': '3em 0 0 0'})
+
 
+@application.route('/ready')
+def ready():
+    if not data_store.seasons():
+        return 'no season data loaded', 503
+    return 'ready'
 
 
 if __name__ == '__main__':
-    application.run(debug=True, port=8080)
+    # Development server only; use gunicorn.conf.py for production. The watcher
+    # is not started on import: under gunicorn's preload it would run in the
+    # master and could hold the store lock while workers fork.
+    data_store.start_watcher()
+    application.run(debug=os.environ.get('DASH_DEBUG') == '1', port=int(os.environ.get('PORT', 8080)))
@@ -1,3 +1,117 @@
 function hi(){
 
-}
\ No newline at end of file
+}
+
+var LEAGUE_BUTTONS = {
+    'prem-btn': 'ENG',
+    'ligue-btn': 'FRA',
+    'laliga-btn': 'ESP',
+    'bundesliga-btn': 'GER',
+    'serie-a-btn': 'ITA'
+};
+
+var HELP_KEYS = ['default', 'intro_button', 'data_button', 'league_button', 'winning_button',
+                 'relegated_button', 'polar_button'];
+
+var SEASON_OUTPUTS = 5;
+
+function cachedSeason(cache, version, season) {
+    if (!cache || cache.version !== version || !cache.seasons) {
+        return null;
+    }
+    return cache.seasons[String(season)] || null;
+}
+
+function noUpdates(count) {
+    var updates = [];
+    for (var i = 0; i < count; i++) {
+        updates.push(window.dash_clientside.no_update);
+    }
+    return updates;
+}
+
+function teamOptionList(teams, selected) {
+    selected = selected || [];
+    var names = selected.concat(teams.filter(function (team) {
+        return selected.indexOf(team) === -1;
+    }));
+    return names.map(function (name) {
+        return {'label': name, 'value': name, 'search': name};
+    });
+}
+
+function triggeredId() {
+    var triggered = window.dash_clientside.callback_context.triggered;
+    if (!triggered || !triggered.length) {
+        return '';
+    }
+    return triggered[0].prop_id.split('.')[0];
+}
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    clientside: {
+        helpPanel: function () {
+            var active = triggeredId();
+            if (HELP_KEYS.indexOf(active) === -1) {
+                active = 'default';
+            }
+            return HELP_KEYS.map(function (key) {
+                return {'display': key === active ? 'block' : 'none'};
+            });
+        },
+
+        leagueTable: function (tables) {
+            var league = LEAGUE_BUTTONS[triggeredId()] || 'ENG';
+            return (tables && tables[league]) || [];
+        },
+
+        // Only ask the server for a season the local cache does not hold for
+        // the current data version.
+        seasonRequest: function (season, version, cache) {
+            if (season === undefined || season === null || cachedSeason(cache, version, season)) {
+                return window.dash_clientside.no_update;
+            }
+            return {'season': season, 'version': version};
+        },
+
+        // A bundle fetched under a different data version replaces the whole
+        // cache; the page's version follows the server's.
+        storeSeason: function (fetched, cache) {
+            if (!fetched) {
+                return noUpdates(2);
+            }
+            var seasons = {};
+            if (cache && cache.version === fetched.version && cache.seasons) {
+                seasons = Object.assign({}, cache.seasons);
+            }
+            seasons[String(fetched.season)] = fetched.bundle;
+            return [{'version': fetched.version, 'seasons': seasons}, fetched.version];
+        },
+
+        renderSeason: function (season, cache, version) {
+            var bundle = cachedSeason(cache, version, season);
+            if (!bundle) {
+                return noUpdates(SEASON_OUTPUTS);
+            }
+            return [bundle.league, bundle.winners, bundle.relegated,
+                    bundle.figures.winners, bundle.figures.relegated];
+        },
+
+        teamOptions: function (season, cache, version, selected) {
+            var bundle = cachedSeason(cache, version, season);
+            if (!bundle) {
+                return window.dash_clientside.no_update;
+            }
+            return teamOptionList(bundle.teams, selected);
+        },
+
+        // An empty selection only needs the server once, to draw the empty chart.
+        polarRequest: function (teams, season, previous) {
+            teams = teams || [];
+            if (!teams.length && previous && !previous.teams.length) {
+                return window.dash_clientside.no_update;
+            }
+            return {'teams': teams, 'season': season};
+        }
+    }
+});
@@ -0,0 +1,83 @@
+import os
+import time
+import tempfile
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+# Background execution for slow callbacks. With diskcache installed, callbacks
+# registered through CallbackRegistry.background_callback run as Dash background
+# jobs on a local DiskcacheManager; without it they fall back to running inline.
+
+CACHE_DIR = os.environ.get('BACKGROUND_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'big5-background'))
+RESULT_EXPIRE = int(os.environ.get('BACKGROUND_RESULT_EXPIRE', 600))
+# Backstop for a lock whose owner died without releasing it; a cancelled job
+# releases its lock straight away through the manager below.
+LOCK_EXPIRE = int(os.environ.get('BACKGROUND_LOCK_EXPIRE', 60))
+POLL_INTERVAL = 0.05
+
+_missing = object()
+_cache = None
+_manager = None
+
+
+def cache():
+    global _cache
+    if _cache is None and diskcache is not None:
+        _cache = diskcache.Cache(CACHE_DIR)
+    return _cache
+
+
+def _owner_key(pid):
+    return 'owner:%d' % pid
+
+
+def release_locks(pid):
+    # Jobs run in their own process, so the job id is the pid that owns the lock.
+    store = cache()
+    lock_key = store.pop(_owner_key(pid), default=None)
+    if lock_key is not None and store.get(lock_key) == pid:
+        store.delete(lock_key)
+
+
+def manager():
+    global _manager
+    if _manager is None and diskcache is not None:
+        from dash import DiskcacheManager
+
+        class Manager(DiskcacheManager):
+            def terminate_job(self, job):
+                super().terminate_job(job)
+                if job is not None:
+                    release_locks(int(job))
+
+        _manager = Manager(cache(), expire=RESULT_EXPIRE)
+    return _manager
+
+
+def single_flight(key, compute):
+    # Identical jobs started by different sessions share one computation: the
+    # first takes the lock and stores the result, the rest poll for it. A lock
+    # left behind by a killed job is released on cancel or expires.
+    store = cache()
+    if store is None:
+        return compute()
+    result_key = 'result:' + key
+    lock_key = 'lock:' + key
+    pid = os.getpid()
+    while True:
+        result = store.get(result_key, default=_missing)
+        if result is not _missing:
+            return result
+        if store.add(lock_key, pid, expire=LOCK_EXPIRE):
+            break
+        time.sleep(POLL_INTERVAL)
+    store.set(_owner_key(pid), lock_key, expire=LOCK_EXPIRE)
+    try:
+        result = compute()
+        store.set(result_key, result, expire=RESULT_EXPIRE)
+        return result
+    finally:
+        release_locks(pid)
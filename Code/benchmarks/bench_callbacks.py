@@ -0,0 +1,185 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import resource
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+# Load benchmark for the Dash callback endpoint. Requests go straight to
+# /_dash-update-component through Flask's test client, so the numbers cover the
+# server side of each callback without browser or network noise.
+#
+#     python benchmarks/bench_callbacks.py --requests 300 --concurrency 8 --save after.json
+#     python benchmarks/bench_callbacks.py --compare before.json
+
+CODE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, CODE_DIR)
+warnings.filterwarnings('ignore')
+
+POLAR_TEAMS = ['Arsenal', 'Chelsea', 'Liverpool', 'Barcelona', 'Real Madrid', 'Juventus', 'Bayern Munich',
+               'Paris S-G', 'Dortmund', 'Napoli', 'Tottenham', 'Manchester City']
+
+
+def prop(id, property, value):
+    return {'id': id, 'property': property, 'value': value}
+
+
+def outputs(*props):
+    return {
+        'output': '..' + '...'.join('%s.%s' % prop for prop in props) + '..',
+        'outputs': [{'id': id, 'property': property} for id, property in props],
+    }
+
+
+def season_change(seasons):
+    # A season missing from the browser cache; cached seasons never reach the server.
+    return {
+        'output': 'season-fetched.data',
+        'outputs': {'id': 'season-fetched', 'property': 'data'},
+        'inputs': [prop('season-request', 'data', {'season': random.choice(seasons), 'version': None})],
+        'changedPropIds': ['season-request.data'],
+        'state': [],
+    }
+
+
+def page_change(seasons):
+    return {
+        'output': 'page-content.children',
+        'outputs': {'id': 'page-content', 'property': 'children'},
+        'inputs': [prop('url', 'pathname', random.choice(['/', '/team-page', '/trends']))],
+        'changedPropIds': ['url.pathname'],
+        'state': [],
+    }
+
+
+def polar_edit(seasons):
+    teams = random.sample(POLAR_TEAMS, random.randint(1, 4))
+    body = outputs(('polar-graph', 'figure'), ('polar-graph-container', 'style'), ('polar-message', 'children'))
+    body.update({
+        'inputs': [prop('polar-request', 'data', {'teams': teams, 'season': random.choice(seasons)})],
+        'changedPropIds': ['polar-request.data'],
+        'state': [],
+    })
+    return body
+
+
+# League button clicks and the help panel run clientside, so they never reach
+# the server; a season change is what ships the league tables now.
+SCENARIOS = {
+    'season_change': season_change,
+    'page_change': page_change,
+    'polar_edit': polar_edit,
+}
+
+
+def percentile(values, q):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(q / 100.0 * (len(values) - 1))))
+    return values[index]
+
+
+def peak_memory_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    return peak / (1024.0 * 1024.0) if sys.platform == 'darwin' else peak / 1024.0
+
+
+def run_scenario(server, build, seasons, requests, concurrency):
+    def one(_):
+        client = server.test_client()
+        body = build(seasons)
+        start = time.perf_counter()
+        try:
+            response = client.post('/_dash-update-component', json=body)
+        except Exception as error:
+            # A failing request is counted, not fatal, so the report still gets written.
+            print('%s raised %r' % (body['output'], error), file=sys.stderr)
+            return time.perf_counter() - start, 0, False
+        elapsed = time.perf_counter() - start
+        ok = response.status_code in (200, 204)
+        if not ok:
+            print('%s returned %d' % (body['output'], response.status_code), file=sys.stderr)
+        return elapsed, len(response.get_data()), ok
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(requests)))
+    total = time.perf_counter() - start
+    latencies = [r[0] * 1000.0 for r in results]
+    errors = sum(1 for r in results if not r[2])
+    return {
+        'requests': requests,
+        'concurrency': concurrency,
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+        'p99_ms': percentile(latencies, 99),
+        'requests_per_sec': requests / total if total else 0.0,
+        'mean_response_bytes': sum(r[1] for r in results) / float(len(results)),
+        'errors': errors,
+        'error_rate': errors / float(requests),
+    }
+
+
+def run(requests, concurrency, scenarios, seed=0):
+    random.seed(seed)
+    os.chdir(CODE_DIR)
+    start = time.perf_counter()
+    import application
+    import data_store
+    startup = time.perf_counter() - start
+    seasons = data_store.seasons()
+    report = {
+        'startup_sec': startup,
+        'python': sys.version.split()[0],
+        'callbacks': {},
+    }
+    for name in scenarios:
+        report['callbacks'][name] = run_scenario(application.application, SCENARIOS[name], seasons,
+                                                 requests, concurrency)
+    report['peak_memory_mb'] = peak_memory_mb()
+    return report
+
+
+def compare(report, baseline):
+    lines = []
+    for name, result in report['callbacks'].items():
+        before = baseline.get('callbacks', {}).get(name)
+        if before is None:
+            continue
+        for key in ('p50_ms', 'p95_ms', 'p99_ms', 'requests_per_sec'):
+            change = (result[key] - before[key]) / before[key] * 100.0 if before[key] else 0.0
+            lines.append('%-15s %-17s %10.2f -> %10.2f (%+.1f%%)' % (name, key, before[key], result[key], change))
+        lines.append('%-15s %-17s %10.3f -> %10.3f' % (name, 'error_rate', before.get('error_rate', 0.0),
+                                                       result['error_rate']))
+    before = baseline.get('peak_memory_mb')
+    if before:
+        lines.append('%-33s %10.1f -> %10.1f' % ('peak_memory_mb', before, report['peak_memory_mb']))
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the Dash callback endpoint.')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS))
+    parser.add_argument('--save', help='write the JSON report to this path')
+    parser.add_argument('--compare', help='baseline JSON report to compare against')
+    args = parser.parse_args(argv)
+
+    report = run(args.requests, args.concurrency, args.scenario or list(SCENARIOS))
+    print(json.dumps(report, indent=2))
+    if args.save:
+        with open(args.save, 'w') as fh:
+            json.dump(report, fh, indent=2)
+    if args.compare:
+        with open(args.compare) as fh:
+            print('\n'.join(compare(report, json.load(fh))))
+
+
+if __name__ == '__main__':
+    main()
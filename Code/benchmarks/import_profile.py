@@ -0,0 +1,79 @@
+import os
+import re
+import sys
+import json
+import argparse
+import subprocess
+
+# Startup benchmark: imports the app under `python -X importtime` in a fresh
+# interpreter and summarizes where worker boot time goes.
+#
+#     python benchmarks/import_profile.py --save startup.json
+#     python benchmarks/import_profile.py --compare startup.json
+
+CODE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+WATCHED = ['plotly.express', 'plotly.graph_objects', 'matplotlib', 'pandas', 'dash', 'pyarrow']
+
+
+def parse(stderr):
+    modules = []
+    for line in stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append({
+                'module': name,
+                'self_ms': int(self_us) / 1000.0,
+                'cumulative_ms': int(cumulative_us) / 1000.0,
+                'depth': len(indent) // 2,
+            })
+    return modules
+
+
+def profile(target='application'):
+    env = dict(os.environ, DATA_WATCH_INTERVAL='0')
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ' + target],
+                            cwd=CODE_DIR, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr[-2000:])
+    return parse(result.stderr)
+
+
+def summarize(modules, top=15):
+    by_name = {m['module']: m for m in modules}
+    top_level = [m for m in modules if m['depth'] == 0]
+    return {
+        'total_ms': sum(m['cumulative_ms'] for m in top_level),
+        'module_count': len(modules),
+        'top_level': sorted(({'module': m['module'], 'cumulative_ms': m['cumulative_ms']} for m in top_level),
+                            key=lambda m: m['cumulative_ms'], reverse=True)[:top],
+        'slowest_self': sorted(({'module': m['module'], 'self_ms': m['self_ms']} for m in modules),
+                               key=lambda m: m['self_ms'], reverse=True)[:top],
+        'watched': {name: by_name[name]['cumulative_ms'] if name in by_name else None for name in WATCHED},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Profile the import time of the dashboard.')
+    parser.add_argument('--target', default='application')
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--save', help='write the JSON summary to this path')
+    parser.add_argument('--compare', help='baseline JSON summary to compare against')
+    args = parser.parse_args(argv)
+
+    summary = summarize(profile(args.target), args.top)
+    print(json.dumps(summary, indent=2))
+    if args.save:
+        with open(args.save, 'w') as fh:
+            json.dump(summary, fh, indent=2)
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+        print('total_ms %.1f -> %.1f' % (baseline['total_ms'], summary['total_ms']))
+        for name in WATCHED:
+            print('%-22s %s -> %s' % (name, baseline['watched'].get(name), summary['watched'].get(name)))
+
+
+if __name__ == '__main__':
+    main()
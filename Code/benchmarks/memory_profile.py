@@ -0,0 +1,36 @@
+import os
+import sys
+import argparse
+import pandas as pd
+
+# Memory benchmark: deep memory usage of the loaded season frames with the
+# compact schema, next to the same files read with pandas' default dtypes.
+#
+#     python benchmarks/memory_profile.py
+
+CODE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, CODE_DIR)
+
+import data_store  # noqa: E402
+
+
+def default_dtypes_bytes(data_dir=data_store.DATA_DIR):
+    return {season: int(pd.read_csv(path, thousands=',').memory_usage(deep=True).sum())
+            for season, path in data_store.season_files(data_dir).items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Report the memory footprint of the season frames.')
+    parser.add_argument('--data-dir', default=data_store.DATA_DIR)
+    args = parser.parse_args(argv)
+
+    data_store.load(args.data_dir)
+    report = data_store.memory_report()
+    baseline = default_dtypes_bytes(args.data_dir)
+    report['default_bytes'] = pd.Series(baseline)
+    report.loc['seasons total', 'default_bytes'] = sum(baseline.values())
+    print(report.to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+import time
+import logging
+import threading
+import functools
+from collections import defaultdict
+import flask
+
+# Registry for the server-side Dash callbacks. Every handler is wrapped with
+# timing instrumentation and the totals are exposed on /metrics in the
+# Prometheus text format.
+
+PHASES = ['pandas', 'figure']
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+def timed(phase):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            timings = getattr(_local, 'timings', None)
+            # Nested helpers are already covered by the outermost timer.
+            if timings is None or getattr(_local, 'phase', None) is not None:
+                return func(*args, **kwargs)
+            _local.phase = phase
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timings[phase] += time.perf_counter() - start
+                _local.phase = None
+        return wrapper
+    return decorator
+
+
+class CallbackRegistry:
+    def __init__(self, app):
+        self.app = app
+        self.handlers = {}
+        self.stats = defaultdict(lambda: defaultdict(float))
+        self.collectors = []
+        self._lock = threading.Lock()
+        app.server.after_request(self._record_response_size)
+        app.server.add_url_rule('/metrics', 'metrics', self.metrics)
+
+    def callback(self, *args, **kwargs):
+        def decorator(func):
+            name = func.__name__
+            if name in self.handlers:
+                raise ValueError("Callback handler '%s' is already registered" % name)
+            self.handlers[name] = func
+
+            @functools.wraps(func)
+            def wrapper(*func_args, **func_kwargs):
+                _local.timings = defaultdict(float)
+                _local.phase = None
+                start = time.perf_counter()
+                try:
+                    return func(*func_args, **func_kwargs)
+                finally:
+                    wall = time.perf_counter() - start
+                    self._record(name, wall, _local.timings)
+                    _local.timings = None
+                    if flask.has_request_context():
+                        flask.g.callback_name = name
+
+            self.app.callback(*args, **kwargs)(wrapper)
+            return func
+        return decorator
+
+    def background_callback(self, *args, progress=None, cancel=None, running=None, progress_default=None):
+        # Runs the handler as a Dash background job so slow views never hold a
+        # request thread. Handlers registered with progress take set_progress as
+        # their first argument, as Dash passes it. Without a background manager
+        # (diskcache not installed) the handler runs inline like any callback.
+        import background
+        manager = background.manager()
+
+        def decorator(func):
+            if manager is None:
+                handler = func
+                if progress is not None:
+                    handler = functools.wraps(func)(lambda *func_args: func(lambda value: None, *func_args))
+                self.callback(*args)(handler)
+                return func
+            name = func.__name__
+            if name in self.handlers:
+                raise ValueError("Callback handler '%s' is already registered" % name)
+            self.handlers[name] = func
+            # Jobs run in a worker process, so their timings are not recorded here.
+            self.app.callback(*args, background=True, manager=manager, progress=progress, cancel=cancel,
+                              running=running, progress_default=progress_default)(func)
+            return func
+        return decorator
+
+    def add_collector(self, collector):
+        self.collectors.append(collector)
+
+    def _record(self, name, wall, timings):
+        with self._lock:
+            stats = self.stats[name]
+            stats['calls'] += 1
+            stats['wall'] += wall
+            for phase in PHASES:
+                stats[phase] += timings[phase]
+
+    def _record_response_size(self, response):
+        # Registered before the compression hook, so Flask runs it afterwards and
+        # sees both the raw size and what actually goes over the wire.
+        name = flask.g.get('callback_name')
+        if name is not None and not response.direct_passthrough:
+            wire = len(response.get_data())
+            raw = flask.g.get('uncompressed_bytes', wire)
+            with self._lock:
+                self.stats[name]['bytes'] += raw
+                self.stats[name]['wire_bytes'] += wire
+            logger.info('%s response: %d bytes, %d on the wire', name, raw, wire)
+        return response
+
+    def metric_lines(self):
+        with self._lock:
+            stats = {name: dict(values) for name, values in self.stats.items()}
+        families = [
+            ('dash_callback_calls_total', 'counter', 'Number of callback invocations.', 'calls'),
+            ('dash_callback_wall_seconds_total', 'counter', 'Wall time spent in the callback.', 'wall'),
+            ('dash_callback_pandas_seconds_total', 'counter', 'Time spent in pandas helpers.', 'pandas'),
+            ('dash_callback_figure_seconds_total', 'counter', 'Time spent building figures.', 'figure'),
+            ('dash_callback_response_bytes_total', 'counter', 'Serialized response size.', 'bytes'),
+            ('dash_callback_wire_bytes_total', 'counter', 'Response size after compression.', 'wire_bytes'),
+        ]
+        lines = []
+        for metric, kind, help_text, key in families:
+            lines.append('# HELP %s %s' % (metric, help_text))
+            lines.append('# TYPE %s %s' % (metric, kind))
+            for name in sorted(stats):
+                lines.append('%s{callback="%s"} %s' % (metric, name, repr(float(stats[name].get(key, 0)))))
+        for collector in self.collectors:
+            lines.extend(collector())
+        return lines
+
+    def metrics(self):
+        return flask.Response('\n'.join(self.metric_lines()) + '\n',
+                              mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import data_store
+
+# Batched multi-team comparison. stat_array returns the eight polar stats for
+# N teams x M seasons as one (N, M, 8) array, with NaN where a team did not play
+# in a season, so rows always line up with the requested teams.
+
+STATS = ['MP', 'W', 'D', 'L', 'GF', 'GA', 'GD', 'Pts']
+ATTRIBUTES = ["Matches Played", "Wins", "Draws", "Losses", "Goals For", "Goals Against", "Goal \nDifference",
+              "Points"]
+NORMALIZATIONS = [None, 'per_game', 'zscore']
+
+POLAR_LAYOUT = dict(
+    title="Team Stats", font_size=14,
+    polar=dict(bgcolor="#F0F8FF", angularaxis=dict(gridcolor='#40E0D0'),
+               radialaxis=dict(gridcolor="#40E0D0", linecolor="#40E0D0")),
+    font=dict(family="'Verlag', sans-serif", color="#003399"),
+    paper_bgcolor="white",
+)
+
+
+def normalized_stats(frame, normalize=None):
+    stats = frame[STATS].astype('float64')
+    if normalize == 'per_game':
+        # Per game, MP is always 1, which keeps the radial axis on the scale of
+        # the other stats.
+        stats[STATS[1:]] = stats[STATS[1:]].div(stats['MP'], axis=0)
+        stats['MP'] = 1.0
+    elif normalize == 'zscore':
+        # z-score within each league and season, so teams from different
+        # leagues are compared against their own competition.
+        keys = [frame.index.get_level_values('Season'), frame['Country']]
+        grouped = stats.groupby(keys, observed=True)
+        stats = (stats - grouped.transform('mean')) / grouped.transform('std', ddof=0).replace(0, np.nan)
+        stats = stats.fillna(0.0)
+    elif normalize is not None:
+        raise ValueError("Unknown normalization '%s'" % normalize)
+    return stats
+
+
+def stat_array(teams, seasons, normalize=None, frame=None):
+    frame = data_store.all_seasons_frame() if frame is None else frame
+    stats = normalized_stats(frame, normalize)
+    stats.index = pd.MultiIndex.from_arrays([frame['Squad'].astype(str).values,
+                                             frame.index.get_level_values('Season')], names=['Squad', 'Season'])
+    stats = stats[~stats.index.duplicated()]
+    wanted = pd.MultiIndex.from_product([list(teams), [int(s) for s in seasons]], names=['Squad', 'Season'])
+    values = stats.reindex(wanted).to_numpy()
+    return values.reshape(len(teams), len(seasons), len(STATS))
+
+
+def polar_figure(values, names, title="Team Stats"):
+    import plotly.graph_objects as go
+    # One Figure constructor call for all traces; rows with no data (team absent
+    # that season) are dropped together with their name.
+    values = np.asarray(values, dtype='float64').reshape(-1, len(STATS))
+    present = ~np.isnan(values).all(axis=1)
+    traces = [dict(type='scatterpolar', r=row, theta=ATTRIBUTES, fill='toself', name=name)
+              for row, name in zip(values[present].tolist(), np.asarray(names, dtype=object)[present])]
+    return go.Figure(data=traces, layout=dict(POLAR_LAYOUT, title=title))
+
+
+def compare(teams, seasons, normalize=None):
+    teams = list(teams)
+    seasons = [int(s) for s in seasons]
+    values = stat_array(teams, seasons, normalize)
+    if len(seasons) == 1:
+        names = teams
+    else:
+        names = ['%s (%s)' % (team, data_store.season_label(season)) for team in teams for season in seasons]
+    return polar_figure(values, names)
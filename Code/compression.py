@@ -0,0 +1,76 @@
+import os
+import re
+import gzip
+import flask
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Compresses JSON responses from the Flask server. Dash callback payloads are
+# repetitive component trees, so they shrink by roughly an order of magnitude.
+# Brotli is used when the package is installed and the client accepts it.
+
+MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 500))
+GZIP_LEVEL = int(os.environ.get('COMPRESS_GZIP_LEVEL', 6))
+BROTLI_QUALITY = int(os.environ.get('COMPRESS_BROTLI_QUALITY', 5))
+MIMETYPES = {'application/json', 'text/html', 'text/plain', 'text/css', 'application/javascript',
+             'text/javascript'}
+ETAG_SUFFIX = re.compile(r'-(gzip|br)"')
+
+
+def choose_encoding(accept_encoding):
+    accepted = {part.split(';')[0].strip() for part in accept_encoding.lower().split(',')}
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+
+def strip_etag_suffix():
+    # Compressed responses carry '<etag>-<coding>', but Dash and Werkzeug check
+    # If-None-Match against their own unsuffixed tag, so the suffix is dropped
+    # before any view runs and put back on the 304 in compress_response.
+    header = flask.request.environ.get('HTTP_IF_NONE_MATCH')
+    if header:
+        codings = ETAG_SUFFIX.findall(header)
+        if codings:
+            flask.g.etag_coding = codings[0]
+            flask.request.environ['HTTP_IF_NONE_MATCH'] = ETAG_SUFFIX.sub('"', header)
+
+
+def compress_response(response):
+    if response.status_code == 304 and 'etag_coding' in flask.g:
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag('%s-%s' % (etag, flask.g.etag_coding))
+        response.vary.add('Accept-Encoding')
+        return response
+    if (response.direct_passthrough or response.status_code < 200 or response.status_code >= 300
+            or 'Content-Encoding' in response.headers or response.mimetype not in MIMETYPES):
+        return response
+    encoding = choose_encoding(flask.request.headers.get('Accept-Encoding', ''))
+    data = response.get_data()
+    flask.g.uncompressed_bytes = len(data)
+    if encoding is None or len(data) < MIN_SIZE:
+        return response
+    if encoding == 'br':
+        body = brotli.compress(data, quality=BROTLI_QUALITY)
+    else:
+        body = gzip.compress(data, compresslevel=GZIP_LEVEL)
+    response.set_data(body)
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        # A strong ETag must differ between encodings of the same resource.
+        response.set_etag('%s-%s' % (etag, encoding))
+    response.headers['Content-Encoding'] = encoding
+    response.headers['Content-Length'] = str(len(body))
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def init_app(server):
+    server.before_request(strip_etag_suffix)
+    server.after_request(compress_response)
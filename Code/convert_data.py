@@ -0,0 +1,26 @@
+import os
+import sys
+import pandas as pd
+import data_store
+
+# Compiles Teams_Stats/Big_5_*.csv into one uncompressed Feather (Arrow IPC)
+# file that data_store loads at startup instead of parsing the CSVs, which is
+# faster. Run from the Code directory:
+#     python convert_data.py [output]
+# The file keeps the compact dtypes from data_store.DTYPES.
+
+
+def convert(data_dir=data_store.DATA_DIR, output=None):
+    from pyarrow import feather
+
+    output = output or os.path.join(data_dir, data_store.COLUMNAR_FILE)
+    files = data_store.season_files(data_dir)
+    frames = [data_store.read_season(path).assign(Season=season) for season, path in files.items()]
+    frame = data_store.apply_schema(pd.concat(frames, ignore_index=True), output)
+    frame['Season'] = frame['Season'].astype('int16')
+    feather.write_feather(frame, output, compression='uncompressed')
+    return output
+
+
+if __name__ == '__main__':
+    print(convert(output=sys.argv[1] if len(sys.argv) > 1 else None))
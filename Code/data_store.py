@@ -0,0 +1,349 @@
+import os
+import re
+import hashlib
+import glob
+import time
+import logging
+import itertools
+import threading
+import pandas as pd
+import quality
+
+# Process-wide season store. Every Teams_Stats/Big_5_N.csv is parsed once and
+# kept in a single frame indexed by (Season, row), so callbacks never touch disk.
+# A watcher thread polls the directory and reloads only the seasons whose file
+# changed; listeners registered with add_listener drop their derived caches.
+# Files are checked by quality.validate before they are swapped in; a season
+# with errors is rejected and the previous copy, if any, keeps serving.
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Teams_Stats')
+SEASON_FILE = re.compile(r'Big_5_(\d+)\.csv$')
+COLUMNAR_FILE = 'big5.feather'
+WATCH_INTERVAL = float(os.environ.get('DATA_WATCH_INTERVAL', 30))
+
+COLUMNS = ['Rk', 'Squad', 'Country', 'LgRk', 'League_Status', 'MP', 'W', 'D', 'L', 'GF', 'GA', 'GD', 'Pts',
+           'Pts/G', 'Attendance', 'Top Team Scorer', 'Goalkeeper']
+NUMERIC_COLUMNS = ['Rk', 'LgRk', 'MP', 'W', 'D', 'L', 'GF', 'GA', 'GD', 'Pts', 'Pts/G', 'Attendance']
+
+# Compact in-memory schema. Repeated strings become categoricals and the
+# per-team stats fit in int16. Attendance exceeds int16 and is missing for the
+# behind-closed-doors season, hence the nullable Int32.
+CATEGORY_COLUMNS = ['Squad', 'Country', 'League_Status', 'Top Team Scorer', 'Goalkeeper']
+INT_COLUMNS = ['Rk', 'LgRk', 'MP', 'W', 'D', 'L', 'GF', 'GA', 'GD', 'Pts']
+DTYPES = dict({column: 'category' for column in CATEGORY_COLUMNS},
+              **{column: 'int16' for column in INT_COLUMNS}, **{'Pts/G': 'float32', 'Attendance': 'Int32'})
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.RLock()
+_frame = None
+_seasons = {}
+_mtimes = {}
+_digests = {}
+_rejected = {}
+_report = quality.validate(pd.DataFrame(columns=COLUMNS + ['Season']))
+_versions = {}
+_version = 0
+_counter = itertools.count(1)
+_listeners = []
+_watcher = None
+
+
+class SchemaError(ValueError):
+    pass
+
+
+def season_files(data_dir=DATA_DIR):
+    files = {}
+    for path in glob.glob(os.path.join(data_dir, 'Big_5_*.csv')):
+        match = SEASON_FILE.search(os.path.basename(path))
+        if match:
+            files[int(match.group(1))] = path
+    return dict(sorted(files.items()))
+
+
+def validate_schema(frame, path):
+    missing = [c for c in COLUMNS if c not in frame.columns]
+    unknown = [c for c in frame.columns if c not in COLUMNS]
+    if missing or unknown:
+        raise SchemaError('%s: missing columns %s, unknown columns %s' % (path, missing, unknown))
+    not_numeric = [c for c in NUMERIC_COLUMNS if not pd.api.types.is_numeric_dtype(frame[c])]
+    if not_numeric:
+        raise SchemaError('%s: non-numeric values in %s' % (path, not_numeric))
+    return frame[COLUMNS]
+
+
+def apply_schema(frame, path=None):
+    try:
+        compact = frame.astype(DTYPES)
+    except (TypeError, ValueError) as error:
+        raise SchemaError('%s: %s' % (path, error))
+    overflow = [c for c in INT_COLUMNS if not (compact[c] == frame[c]).all()]
+    if overflow:
+        raise SchemaError('%s: values out of range in %s' % (path, overflow))
+    return compact
+
+
+def read_season(path):
+    return apply_schema(validate_schema(pd.read_csv(path, thousands=','), path), path)
+
+
+def columnar_path(data_dir=DATA_DIR):
+    # The compiled file is only used while it is newer than every CSV,
+    # otherwise a hand-edited season would be shadowed by stale data.
+    path = os.path.join(data_dir, COLUMNAR_FILE)
+    if not os.path.exists(path):
+        return None
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return None
+    built = os.path.getmtime(path)
+    if any(os.path.getmtime(csv) > built for csv in season_files(data_dir).values()):
+        return None
+    return path
+
+
+def read_columnar(path):
+    # A faster loader than parsing the CSVs, not a zero-copy one: the seasons are
+    # converted to pandas frames with the compact schema like any other read.
+    from pyarrow import feather
+    frame = feather.read_table(path).to_pandas()
+    return {int(season): apply_schema(group[COLUMNS].reset_index(drop=True), path)
+            for season, group in frame.groupby('Season', sort=True)}
+
+
+def read_files(files, mtimes=None):
+    # A file that fails to parse or validate is logged and left out; with
+    # mtimes given it is also remembered in _rejected until it changes again.
+    frames = {}
+    for season, path in files.items():
+        try:
+            frames[season] = read_season(path)
+        except (SchemaError, OSError, pd.errors.ParserError) as error:
+            logger.error('Rejected season %s: %s', season, error)
+            if mtimes is not None:
+                _rejected[season] = mtimes[season]
+    return frames
+
+
+def read_seasons(data_dir=DATA_DIR, mtimes=None):
+    files = season_files(data_dir)
+    path = columnar_path(data_dir)
+    if path is not None:
+        # mtimes and digests come from the CSVs, so the compiled file is only
+        # used while it holds exactly the seasons on disk.
+        frames = read_columnar(path)
+        if set(frames) == set(files):
+            return frames
+        logger.warning('Ignoring %s: seasons %s do not match the CSV files %s', path, sorted(frames), sorted(files))
+    return read_files(files, mtimes)
+
+
+def long_frame(frames):
+    return pd.concat(dict(sorted(frames.items())), names=['Season', 'Row']).reset_index(level='Season')
+
+
+def check_quality(frames, mtimes):
+    # Validates all given seasons in one pass and drops the rejected ones from
+    # frames; the report replaces the stored findings for those seasons.
+    global _report
+    checked = list(frames)
+    report = quality.validate(long_frame(frames)) if frames else _report.iloc[:0]
+    for row in report.itertuples(index=False):
+        log = logger.error if row.severity == 'error' else logger.warning
+        where = ' '.join(str(part) for part in (row.Season, row.Country, row.Squad) if not pd.isna(part))
+        log('Season %s: %s (%s)', where, row.check, row.detail)
+    for season in quality.rejected_seasons(report):
+        logger.error('Rejected season %s: failed data-quality checks', season)
+        _rejected[season] = mtimes[season]
+        del frames[season]
+    with _lock:
+        _report = pd.concat([_report[~_report['Season'].isin(checked)], report], ignore_index=True)
+    return report
+
+
+def file_mtimes(data_dir=DATA_DIR):
+    return {season: os.stat(path).st_mtime_ns for season, path in season_files(data_dir).items()}
+
+
+def file_digest(path):
+    # Content hash of a season file. mtimes only drive change detection; the
+    # digest is what clients and other hosts see, so it must not change with a
+    # checkout or a copy of identical data.
+    digest = hashlib.sha1()
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def _swap(frames, mtimes, changed, digests):
+    global _frame, _seasons, _mtimes, _digests, _version
+    # Concatenating categoricals with different categories yields object
+    # columns, so the schema is applied again to the combined frame; each
+    # season slice keeps only its own categories.
+    # With no loadable season the store holds an empty frame, so the app still
+    # starts and /ready reports that no data is loaded.
+    if frames:
+        frame = apply_schema(pd.concat(dict(sorted(frames.items())), names=['Season', 'Row']))
+    else:
+        frame = apply_schema(pd.DataFrame(columns=COLUMNS, index=pd.MultiIndex.from_arrays(
+            [[], []], names=['Season', 'Row'])))
+    seasons = {season: _season_slice(frame, season) for season in sorted(frames)}
+    with _lock:
+        _frame = frame
+        _seasons = seasons
+        _mtimes = mtimes
+        _digests = digests
+        for season in changed:
+            _versions[season] = next(_counter)
+        _version = next(_counter)
+    for listener in list(_listeners):
+        listener(sorted(changed))
+    return frame
+
+
+def _season_slice(frame, season):
+    season_frame = frame.loc[season]
+    for column in CATEGORY_COLUMNS:
+        season_frame[column] = season_frame[column].cat.remove_unused_categories()
+    return season_frame
+
+
+def load(data_dir=DATA_DIR):
+    with _lock:
+        mtimes = file_mtimes(data_dir)
+        frames = read_seasons(data_dir, mtimes)
+        check_quality(frames, mtimes)
+        files = season_files(data_dir)
+        digests = {season: file_digest(files[season]) for season in frames if season in files}
+        for season in [season for season in mtimes if season not in frames]:
+            if season in _seasons:
+                frames[season] = _seasons[season]
+                mtimes[season] = _mtimes[season]
+                digests[season] = _digests[season]
+            else:
+                del mtimes[season]
+        return _swap(frames, mtimes, set(frames) | set(_seasons), digests)
+
+
+def refresh(data_dir=DATA_DIR):
+    with _lock:
+        mtimes = file_mtimes(data_dir)
+        changed = [season for season, mtime in mtimes.items()
+                   if _mtimes.get(season) != mtime and _rejected.get(season) != mtime]
+        removed = [season for season in _seasons if season not in mtimes]
+        if not changed and not removed:
+            return []
+        frames = {season: frame for season, frame in _seasons.items() if season in mtimes}
+        files = season_files(data_dir)
+        fresh = read_files({season: files[season] for season in changed}, mtimes)
+        check_quality(fresh, mtimes)
+        frames.update(fresh)
+        digests = {season: digest for season, digest in _digests.items() if season in frames}
+        digests.update((season, file_digest(files[season])) for season in fresh)
+        for season in [season for season in changed if season not in fresh]:
+            # Keep serving the previous copy of a season whose new file is bad.
+            changed.remove(season)
+            if season in _mtimes:
+                mtimes[season] = _mtimes[season]
+            else:
+                del mtimes[season]
+        if not changed and not removed:
+            return []
+        _swap(frames, mtimes, set(changed) | set(removed), digests)
+        logger.info('Reloaded seasons %s, removed %s', changed, removed)
+        return sorted(changed + removed)
+
+
+def add_listener(listener):
+    _listeners.append(listener)
+
+
+def _watch(interval):
+    while True:
+        time.sleep(interval)
+        try:
+            refresh()
+        except Exception:
+            logger.exception('Season data refresh failed')
+
+
+def start_watcher(interval=WATCH_INTERVAL):
+    global _watcher
+    if interval <= 0 or (_watcher is not None and _watcher.is_alive()):
+        return _watcher
+    _watcher = threading.Thread(target=_watch, args=(interval,), name='season-watcher', daemon=True)
+    _watcher.start()
+    return _watcher
+
+
+def ensure_loaded():
+    if _frame is None:
+        with _lock:
+            if _frame is None:
+                load()
+
+
+def all_seasons_frame():
+    ensure_loaded()
+    return _frame
+
+
+def seasons():
+    ensure_loaded()
+    return list(_seasons)
+
+
+def version():
+    ensure_loaded()
+    return _version
+
+
+def season_version(season):
+    ensure_loaded()
+    return _versions.get(int(season))
+
+
+def season_fingerprint(season):
+    # Stable across worker processes, unlike season_version, so it can be
+    # handed to clients (ETags, browser caches).
+    ensure_loaded()
+    return '%d-%s' % (int(season), _digests.get(int(season)))
+
+
+def data_fingerprint():
+    ensure_loaded()
+    state = ','.join('%d-%s' % item for item in sorted(_digests.items()))
+    return hashlib.sha1(state.encode()).hexdigest()[:16]
+
+
+def quality_report():
+    ensure_loaded()
+    return _report
+
+
+def memory_report():
+    # Deep memory usage in bytes of every season slice and of the combined frame.
+    ensure_loaded()
+    with _lock:
+        frame, seasons = _frame, dict(_seasons)
+    report = pd.DataFrame({
+        'rows': pd.Series({season: len(season_frame) for season, season_frame in seasons.items()}),
+        'bytes': pd.Series({season: int(season_frame.memory_usage(deep=True).sum())
+                            for season, season_frame in seasons.items()}),
+    }).rename_axis('Season')
+    report.loc['seasons total'] = report.sum()
+    report.loc['combined frame'] = [len(frame), int(frame.memory_usage(deep=True).sum())]
+    return report
+
+
+def season_label(season):
+    start = 2015 + int(season)
+    return '%d/%02d' % (start, (start + 1) % 100)
+
+
+def season_frame(season):
+    ensure_loaded()
+    return _seasons[int(season)]
@@ -0,0 +1,80 @@
+import os
+
+# The data files do not change during an export, so no process needs the
+# watcher. data_store reads this once at import, so it is set before any import.
+os.environ['DATA_WATCH_INTERVAL'] = '0'
+
+import sys
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+import snapshots
+
+# Renders every season x league table, the winners and relegated tables and
+# the two season charts to static JSON and HTML, one season per worker process:
+#     python export_snapshots.py [--output snapshots] [--workers N] [--season 3 ...]
+# The app serves the output under /snapshots/ and reuses the chart JSON.
+
+
+def write(path, text):
+    with open(path, 'w', encoding='utf-8') as fh:
+        fh.write(text)
+
+
+def write_table(directory, name, records, title):
+    write(os.path.join(directory, name + '.json'), json.dumps(records, ensure_ascii=False, default=str))
+    html = pd.DataFrame(records).to_html(index=False, classes='big5_table', border=0)
+    write(os.path.join(directory, name + '.html'),
+          '<html><head><meta charset="utf-8"><title>%s</title></head><body>%s</body></html>' % (title, html))
+
+
+def export_season(season, output):
+    import application
+    import data_store
+    import views
+
+    directory = snapshots.season_dir(season, output)
+    os.makedirs(directory, exist_ok=True)
+    label = data_store.season_label(season)
+    for league, records in views.season_views(season)['league'].items():
+        write_table(directory, 'league_%s' % league, records, '%s %s' % (league, label))
+    write_table(directory, 'winners', views.winner_records(season), 'Winners %s' % label)
+    write_table(directory, 'relegated', views.relegated_records(season), 'Relegated %s' % label)
+    pL = application.input2(season)
+    for kind, figure in (('winners', application.winners_figure(pL)),
+                         ('relegated', application.relegated_figure(pL))):
+        write(os.path.join(directory, '%s_figure.json' % kind), figure.to_json())
+        write(os.path.join(directory, '%s_figure.html' % kind), figure.to_html(include_plotlyjs='cdn'))
+    return season, data_store.season_fingerprint(season)
+
+
+def export(output=snapshots.SNAPSHOT_DIR, seasons=None, workers=None):
+    import data_store
+    seasons = seasons or data_store.seasons()
+    os.makedirs(output, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(export_season, seasons, [output] * len(seasons)))
+    path = os.path.join(output, snapshots.MANIFEST)
+    existing = {}
+    if os.path.exists(path):
+        with open(path) as fh:
+            existing = json.load(fh)['seasons']
+    existing.update({str(season): {'fingerprint': fingerprint, 'label': data_store.season_label(season)}
+                     for season, fingerprint in results})
+    write(path, json.dumps({'seasons': existing}, indent=2))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Export static season snapshots.')
+    parser.add_argument('--output', default=snapshots.SNAPSHOT_DIR)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--season', type=int, action='append')
+    args = parser.parse_args(argv)
+    for season, fingerprint in export(args.output, args.season, args.workers):
+        print('season %d exported (%s)' % (season, fingerprint))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
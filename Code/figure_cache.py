@@ -0,0 +1,61 @@
+import os
+import json
+import threading
+from collections import OrderedDict
+import data_store
+import single_flight
+
+# Bounded LRU cache for built figures. Entries hold the figure already encoded
+# to plain JSON types, so a hit skips both Plotly Express and its serializer.
+# Builders may return a plotly Figure or an already-decoded figure dict.
+# Keys start with the season and carry its data version, so a reloaded season
+# can never be served from an older entry. Concurrent misses on the same key
+# share one build through the single-flight group.
+
+DEFAULT_SIZE = int(os.environ.get('FIGURE_CACHE_SIZE', 256))
+
+
+class FigureCache:
+    def __init__(self, maxsize=DEFAULT_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        return single_flight.group.do(('figure',) + tuple(key), lambda: self._build(key, build))
+
+    def _build(self, key, build):
+        figure = build()
+        if hasattr(figure, 'to_json'):
+            figure = json.loads(figure.to_json())
+        with self._lock:
+            self._data[key] = figure
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return figure
+
+    def invalidate(self, seasons=None):
+        with self._lock:
+            if seasons is None:
+                self._data.clear()
+            else:
+                for key in [k for k in self._data if k[0] in seasons or k[0] == 'trends']:
+                    del self._data[key]
+
+    def stats(self):
+        with self._lock:
+            return {'size': len(self._data), 'maxsize': self.maxsize,
+                    'hits': self.hits, 'misses': self.misses}
+
+
+cache = FigureCache()
+data_store.add_listener(cache.invalidate)
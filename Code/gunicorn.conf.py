@@ -0,0 +1,25 @@
+import os
+import multiprocessing
+
+# Production serving for the dashboard. Run from the Code directory:
+#     gunicorn --config gunicorn.conf.py wsgi:application
+# Send HUP to the master for a graceful reload of all workers.
+
+bind = os.environ.get('BIND', '0.0.0.0:%s' % os.environ.get('PORT', '8080'))
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('WEB_THREADS', 4))
+worker_class = 'gthread'
+preload_app = True
+timeout = int(os.environ.get('WEB_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('WEB_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+max_requests = int(os.environ.get('WEB_MAX_REQUESTS', 2000))
+max_requests_jitter = max_requests // 10
+accesslog = '-'
+
+
+def post_fork(server, worker):
+    # Each worker runs its own season watcher. The preloaded master never starts
+    # one, so no watcher can hold the store lock while a worker is forked.
+    import data_store
+    data_store.start_watcher()
@@ -0,0 +1,103 @@
+import sys
+import pandas as pd
+
+# Data-quality checks for the season files, run by data_store on every load
+# before a season reaches any cache. All seasons are checked at once as one long
+# frame with column arithmetic and groupby, so the pass costs milliseconds.
+# The report has one row per finding; seasons with an 'error' are rejected,
+# 'warning' rows are only logged.
+#
+#     python quality.py
+
+# Relegation places per league, as (fewest, most): the play-off in Ligue 1 and
+# the Bundesliga sends down a third team in some seasons only.
+RELEGATION_PLACES = {'ENG': (3, 3), 'ESP': (3, 3), 'ITA': (3, 3), 'FRA': (2, 3), 'GER': (2, 3)}
+REPORT_COLUMNS = ['Season', 'Country', 'Squad', 'check', 'severity', 'detail']
+
+
+def _findings(frame, mask, check, detail, severity='error'):
+    if not mask.any():
+        return None
+    found = frame.loc[mask]
+    return pd.DataFrame({
+        'Season': found['Season'].to_numpy(),
+        'Country': found['Country'].astype(str).to_numpy(),
+        'Squad': found['Squad'].astype(str).to_numpy() if 'Squad' in found else None,
+        'check': check,
+        'severity': severity,
+        'detail': detail(found).to_numpy(),
+    }, columns=REPORT_COLUMNS)
+
+
+def team_checks(frame):
+    results = frame['W'] + frame['D'] + frame['L']
+    goal_difference = frame['GF'] - frame['GA']
+    points = 3 * frame['W'] + frame['D']
+    return [
+        _findings(frame, results != frame['MP'], 'matches',
+                  lambda f: 'W+D+L=' + (f['W'] + f['D'] + f['L']).astype(str) + ', MP=' + f['MP'].astype(str)),
+        _findings(frame, goal_difference != frame['GD'], 'goal_difference',
+                  lambda f: 'GF-GA=' + (f['GF'] - f['GA']).astype(str) + ', GD=' + f['GD'].astype(str)),
+        _findings(frame, frame['Pts'] > points, 'points',
+                  lambda f: '3W+D=' + (3 * f['W'] + f['D']).astype(str) + ', Pts=' + f['Pts'].astype(str)),
+        # Fewer points than the results give is a points deduction.
+        _findings(frame, frame['Pts'] < points, 'points_deduction',
+                  lambda f: (3 * f['W'] + f['D'] - f['Pts']).astype(str) + ' points deducted', 'warning'),
+        _findings(frame, frame['League_Status'].isna(), 'league_status',
+                  lambda f: pd.Series('League_Status is missing', index=f.index), 'warning'),
+        _findings(frame, frame.duplicated(['Season', 'Squad'], keep=False), 'duplicate_squad',
+                  lambda f: pd.Series('Squad appears more than once in the season', index=f.index)),
+    ]
+
+
+def league_checks(frame):
+    # LgRk must run 1..n within each league, which also guarantees one winner.
+    teams = frame.groupby(['Season', 'Country'], observed=True)['Squad'].transform('size')
+    bad_rank = frame.duplicated(['Season', 'Country', 'LgRk'], keep=False) | (frame['LgRk'] < 1) | \
+        (frame['LgRk'] > teams)
+    findings = [_findings(frame, bad_rank, 'league_rank',
+                          lambda f: 'LgRk=' + f['LgRk'].astype(str) + ' is duplicated or out of range')]
+
+    # Leagues without an entry in RELEGATION_PLACES map to NaN and never match.
+    fewest = {country: places[0] for country, places in RELEGATION_PLACES.items()}
+    most = {country: places[1] for country, places in RELEGATION_PLACES.items()}
+    country = frame['Country'].astype(str)
+    relegated = frame['League_Status'] == 'Relegated'
+    findings.append(_findings(frame, relegated & (frame['LgRk'] <= teams - country.map(most)), 'relegated_rank',
+                              lambda f: 'relegated from LgRk=' + f['LgRk'].astype(str)))
+
+    counts = relegated.groupby([frame['Season'], country]).sum().rename('relegated').reset_index()
+    # A league with no relegated team yet is an in-progress season: only warn.
+    undecided = (counts['relegated'] == 0) & counts['Country'].isin(list(RELEGATION_PLACES))
+    wrong = ~undecided & ((counts['relegated'] < counts['Country'].map(fewest)) |
+                          (counts['relegated'] > counts['Country'].map(most)))
+    findings.append(_findings(counts, wrong, 'relegated_count',
+                              lambda f: f['relegated'].astype(str) + ' teams relegated'))
+    findings.append(_findings(counts, undecided, 'relegated_count',
+                              lambda f: pd.Series('no relegated teams yet', index=f.index), 'warning'))
+    return findings
+
+
+def validate(frame):
+    # frame: every season in long format, with a Season column.
+    findings = [found for found in team_checks(frame) + league_checks(frame) if found is not None]
+    if not findings:
+        return pd.DataFrame(columns=REPORT_COLUMNS)
+    report = pd.concat(findings, ignore_index=True)
+    return report.sort_values(['Season', 'Country', 'check'], ignore_index=True)
+
+
+def rejected_seasons(report):
+    return sorted(int(season) for season in report.loc[report['severity'] == 'error', 'Season'].unique())
+
+
+def main():
+    import data_store
+    frames = data_store.read_seasons()
+    report = validate(data_store.long_frame(frames))
+    print(report.to_string(index=False) if len(report) else 'No findings')
+    return 1 if rejected_seasons(report) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
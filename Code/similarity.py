@@ -0,0 +1,101 @@
+import threading
+import numpy as np
+import data_store
+import comparison
+
+# Team-season similarity search. Every row of the season store becomes one
+# vector of per-game stats, z-scored per feature over all seasons, held in a
+# single contiguous float32 matrix. A query is one matrix-vector product plus
+# an argpartition, so its cost grows linearly with the rows and stays in the
+# low milliseconds.
+
+PER_GAME = ['W', 'D', 'L', 'GF', 'GA', 'GD', 'Pts']
+FEATURES = PER_GAME + ['Pts/G', 'Attendance']
+DEFAULT_K = 5
+
+_lock = threading.Lock()
+_index = None
+
+
+def feature_matrix(frame):
+    matches = frame['MP'].to_numpy(dtype='float64')[:, None]
+    per_game = frame[PER_GAME].to_numpy(dtype='float64') / matches
+    # Pts/G and Attendance are already per game; missing attendance (games
+    # behind closed doors) is imputed with the mean, i.e. a z-score of 0.
+    other = frame[['Pts/G', 'Attendance']].astype('float64').to_numpy(na_value=np.nan)
+    values = np.hstack([per_game, other])
+    mean = np.nanmean(values, axis=0)
+    std = np.nanstd(values, axis=0)
+    std[std == 0] = 1.0
+    values = (values - mean) / std
+    values[np.isnan(values)] = 0.0
+    return np.ascontiguousarray(values, dtype='float32')
+
+
+class SimilarityIndex:
+    def __init__(self, frame, version=None):
+        self.version = version
+        self.matrix = feature_matrix(frame)
+        self.sq_norms = np.einsum('ij,ij->i', self.matrix, self.matrix)
+        self.totals = frame[comparison.STATS].to_numpy(dtype='float64')
+        self.squads = frame['Squad'].astype(str).to_numpy()
+        self.countries = frame['Country'].astype(str).to_numpy()
+        self.seasons = frame.index.get_level_values('Season').to_numpy()
+        self.positions = {(squad, int(season)): position
+                          for position, (squad, season) in enumerate(zip(self.squads, self.seasons))}
+
+    def position(self, squad, season):
+        return self.positions.get((str(squad), int(season)))
+
+    def nearest(self, squad, season, k=DEFAULT_K, other_leagues=False):
+        position = self.position(squad, season)
+        if position is None:
+            return []
+        query = self.matrix[position]
+        # Squared euclidean distance to every row: |a|^2 - 2a.b + |b|^2.
+        distances = self.sq_norms - 2.0 * (self.matrix @ query) + self.sq_norms[position]
+        distances[position] = np.inf
+        if other_leagues:
+            distances[self.countries == self.countries[position]] = np.inf
+        k = min(k, int(np.isfinite(distances).sum()))
+        if k <= 0:
+            return []
+        candidates = np.argpartition(distances, k - 1)[:k]
+        candidates = candidates[np.argsort(distances[candidates], kind='stable')]
+        return [{'position': int(row), 'Squad': self.squads[row], 'Season': int(self.seasons[row]),
+                 'Country': self.countries[row], 'distance': float(np.sqrt(max(distances[row], 0.0)))}
+                for row in candidates]
+
+
+def index():
+    global _index
+    version = data_store.version()
+    current = _index
+    if current is None or current.version != version:
+        current = SimilarityIndex(data_store.all_seasons_frame(), version)
+        with _lock:
+            _index = current
+    return current
+
+
+def nearest(squad, season, k=DEFAULT_K, other_leagues=False):
+    return index().nearest(squad, season, k, other_leagues)
+
+
+def overlay_name(squad, season, country):
+    return '%s (%s, %s)' % (squad, data_store.season_label(season), country)
+
+
+def polar_overlay(squad, season, k=DEFAULT_K, other_leagues=False):
+    # The queried team-season first, then its neighbours, as one polar chart
+    # of the season totals the other polar charts show.
+    current = index()
+    position = current.position(squad, season)
+    if position is None:
+        return None, []
+    neighbours = current.nearest(squad, season, k, other_leagues)
+    rows = [position] + [neighbour['position'] for neighbour in neighbours]
+    values = current.totals[rows]
+    names = [overlay_name(current.squads[row], current.seasons[row], current.countries[row]) for row in rows]
+    title = 'Seasons most similar to %s' % names[0]
+    return comparison.polar_figure(values, names, title=title), neighbours
@@ -0,0 +1,153 @@
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import data_store
+import views
+
+# Monte Carlo season simulation. Each team gets attack and defence ratings from
+# its goals per game relative to its league, every fixture of a double round
+# robin draws Poisson goals for both sides, and whole batches of seasons are
+# simulated as (runs, teams, teams) arrays. The result is the distribution of
+# finishing positions per team.
+#
+#     python simulation.py [--season 5] [--runs 10000] [--workers N]
+
+HOME_ADVANTAGE = float(os.environ.get('SIMULATION_HOME_ADVANTAGE', 1.15))
+BATCH_SIZE = 1000
+TOP_PLACES = 4
+
+
+def team_strengths(frame):
+    # frame holds one league's season; ratings are relative to the league
+    # average, so 1.0 is an average attack or defence.
+    matches = frame['MP'].to_numpy(dtype='float64')
+    scored = frame['GF'].to_numpy(dtype='float64') / matches
+    conceded = frame['GA'].to_numpy(dtype='float64') / matches
+    goals_per_team = scored.mean()
+    return scored / goals_per_team, conceded / goals_per_team, goals_per_team
+
+
+def expected_goals(attack, defence, goals_per_team, home_advantage=HOME_ADVANTAGE):
+    # Row i is the home side, column j the away side.
+    home = goals_per_team * home_advantage * np.outer(attack, defence)
+    away = goals_per_team / home_advantage * np.outer(defence, attack)
+    return home, away
+
+
+def simulate_batch(home_rate, away_rate, runs, rng):
+    teams = len(home_rate)
+    home = rng.poisson(home_rate, size=(runs, teams, teams))
+    away = rng.poisson(away_rate, size=(runs, teams, teams))
+    played = ~np.eye(teams, dtype=bool)
+    home_points = np.where(home > away, 3, np.where(home == away, 1, 0)) * played
+    away_points = np.where(away > home, 3, np.where(home == away, 1, 0)) * played
+    points = home_points.sum(axis=2) + away_points.sum(axis=1)
+    scored = (home * played).sum(axis=2) + (away * played).sum(axis=1)
+    conceded = (away * played).sum(axis=2) + (home * played).sum(axis=1)
+    # Points, then goal difference, then goals scored, then a coin toss.
+    key = (points * 1e6 + (scored - conceded + 1000) * 1e3 + scored + rng.random((runs, teams)))
+    order = np.argsort(-key, axis=1)
+    positions = np.empty_like(order)
+    np.put_along_axis(positions, order, np.arange(teams)[None, :], axis=1)
+    cells = np.arange(teams) * teams + positions
+    counts = np.bincount(cells.ravel(), minlength=teams * teams).reshape(teams, teams)
+    return counts, points.sum(axis=0)
+
+
+def simulate_runs(home_rate, away_rate, runs, seed=None, progress=None):
+    rng = np.random.default_rng(seed)
+    teams = len(home_rate)
+    counts = np.zeros((teams, teams), dtype='int64')
+    points = np.zeros(teams, dtype='int64')
+    for start in range(0, runs, BATCH_SIZE):
+        batch_counts, batch_points = simulate_batch(home_rate, away_rate, min(BATCH_SIZE, runs - start), rng)
+        counts += batch_counts
+        points += batch_points
+        if progress is not None:
+            progress(min(start + BATCH_SIZE, runs), runs)
+    return counts, points
+
+
+def league_frame(season, league):
+    return views.league_table(data_store.season_frame(season), league)
+
+
+def summarize(frame, counts, points, runs):
+    relegation_places = int((frame['League_Status'] == 'Relegated').sum())
+    teams = len(frame)
+    probabilities = counts / runs
+    summary = pd.DataFrame({
+        'Squad': frame['Squad'].astype(str).to_numpy(),
+        'LgRk': frame['LgRk'].to_numpy(),
+        'Pts': frame['Pts'].to_numpy(),
+        'xPts': points / runs,
+        'Title': probabilities[:, 0],
+        'Top 4': probabilities[:, :TOP_PLACES].sum(axis=1),
+        'Relegated': probabilities[:, teams - relegation_places:].sum(axis=1) if relegation_places else 0.0,
+    })
+    positions = pd.DataFrame(probabilities, index=summary['Squad'], columns=range(1, teams + 1))
+    return summary.sort_values('xPts', ascending=False, ignore_index=True), positions
+
+
+def simulate_league(season, league, runs=10000, seed=None, progress=None):
+    frame = league_frame(season, league)
+    home_rate, away_rate = expected_goals(*team_strengths(frame))
+    counts, points = simulate_runs(home_rate, away_rate, runs, seed, progress)
+    return summarize(frame, counts, points, runs)
+
+
+def _simulate_chunk(task):
+    season, league, runs, seed = task
+    frame = league_frame(season, league)
+    home_rate, away_rate = expected_goals(*team_strengths(frame))
+    counts, points = simulate_runs(home_rate, away_rate, runs, seed)
+    return league, counts, points
+
+
+def simulate_all(season, runs=10000, workers=None, seed=None):
+    # Every league is split into chunks so the pool keeps all cores busy even
+    # though there are only five leagues; chunk seeds come from one
+    # SeedSequence, so a seeded run is reproducible for a given worker count.
+    workers = workers or os.cpu_count() or 1
+    leagues = [league for league in views.LEAGUES if league in set(data_store.season_frame(season)['Country'])]
+    chunks = max(1, -(-workers // len(leagues)))
+    sizes = [runs // chunks + (1 if i < runs % chunks else 0) for i in range(chunks)]
+    seeds = iter(np.random.SeedSequence(seed).spawn(len(leagues) * chunks))
+    tasks = [(season, league, size, next(seeds)) for league in leagues for size in sizes if size]
+    totals = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for league, counts, points in pool.map(_simulate_chunk, tasks):
+            if league in totals:
+                totals[league] = (totals[league][0] + counts, totals[league][1] + points)
+            else:
+                totals[league] = (counts, points)
+    return {league: summarize(league_frame(season, league), counts, points, runs)
+            for league, (counts, points) in totals.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Simulate the Big 5 league seasons.')
+    parser.add_argument('--season', type=int)
+    parser.add_argument('--runs', type=int, default=10000)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args(argv)
+
+    season = data_store.seasons()[-1] if args.season is None else args.season
+    start = time.perf_counter()
+    results = simulate_all(season, args.runs, args.workers, args.seed)
+    elapsed = time.perf_counter() - start
+    pd.set_option('display.width', 120)
+    for league, (summary, positions) in results.items():
+        print('%s %s' % (league, data_store.season_label(season)))
+        print(summary.to_string(index=False, float_format='%.3f'))
+        print()
+    print('%d runs of %d leagues in %.2fs' % (args.runs, len(results), elapsed), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
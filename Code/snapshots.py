@@ -0,0 +1,56 @@
+import os
+import json
+import flask
+import data_store
+
+# Pre-rendered season snapshots written by export_snapshots.py. A snapshot is
+# only used while its recorded fingerprint matches the loaded data, so an
+# edited or newly ingested season falls back to live rendering.
+
+SNAPSHOT_DIR = os.environ.get('SNAPSHOT_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                           'snapshots'))
+MAX_AGE = int(os.environ.get('SNAPSHOT_MAX_AGE', 86400))
+MANIFEST = 'manifest.json'
+
+_manifest = {}
+
+
+def season_dir(season, snapshot_dir=SNAPSHOT_DIR):
+    return os.path.join(snapshot_dir, str(int(season)))
+
+
+def manifest(snapshot_dir=SNAPSHOT_DIR):
+    path = os.path.join(snapshot_dir, MANIFEST)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return {}
+    if _manifest.get('mtime') != mtime:
+        with open(path) as fh:
+            _manifest.update(mtime=mtime, seasons=json.load(fh)['seasons'])
+    return _manifest['seasons']
+
+
+def is_current(season):
+    entry = manifest().get(str(int(season)))
+    return entry is not None and entry['fingerprint'] == data_store.season_fingerprint(season)
+
+
+def load_figure(season, kind):
+    if not is_current(season):
+        return None
+    path = os.path.join(season_dir(season), '%s_figure.json' % kind)
+    if not os.path.exists(path):
+        return None
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def serve(filename):
+    response = flask.send_from_directory(SNAPSHOT_DIR, filename)
+    response.headers['Cache-Control'] = 'public, max-age=%d' % MAX_AGE
+    return response
+
+
+def init_app(server):
+    server.add_url_rule('/snapshots/<path:filename>', 'snapshots', serve)
@@ -0,0 +1,136 @@
+import re
+import bisect
+import difflib
+import threading
+import unicodedata
+from collections import defaultdict
+import data_store
+
+# Precomputed team index over every season in the store: squad name to row
+# positions per season, plus a normalized token index for the searchable polar
+# dropdown. Normalization folds accents and punctuation, so "cadiz" finds
+# "Cádiz" and "paris sg" finds "Paris S-G".
+
+MAX_RESULTS = 100
+
+ALIASES = {
+    'psg': 'Paris S-G',
+    'paris saint germain': 'Paris S-G',
+    'man utd': 'Manchester Utd',
+    'man united': 'Manchester Utd',
+    'manchester united': 'Manchester Utd',
+    'man city': 'Manchester City',
+    'spurs': 'Tottenham',
+    'tottenham hotspur': 'Tottenham',
+    'wolverhampton': 'Wolves',
+    'west bromwich': 'West Brom',
+    'newcastle united': 'Newcastle Utd',
+    'sheffield united': 'Sheffield Utd',
+    'inter milan': 'Inter',
+    'internazionale': 'Inter',
+    'ac milan': 'Milan',
+    'bayern': 'Bayern Munich',
+    'bayern munchen': 'Bayern Munich',
+    'borussia dortmund': 'Dortmund',
+    'bvb': 'Dortmund',
+    'gladbach': "M'Gladbach",
+    'monchengladbach': "M'Gladbach",
+    'borussia monchengladbach': "M'Gladbach",
+    'eintracht frankfurt': 'Eint Frankfurt',
+    'bayer leverkusen': 'Leverkusen',
+    'cologne': 'Köln',
+    'atletico': 'Atlético Madrid',
+    'atleti': 'Atlético Madrid',
+    'real betis': 'Betis',
+    'athletic bilbao': 'Athletic Club',
+    'deportivo': 'La Coruña',
+    'st etienne': 'Saint-Étienne',
+    'olympique lyonnais': 'Lyon',
+    'olympique de marseille': 'Marseille',
+    'verona': 'Hellas Verona',
+}
+
+_lock = threading.Lock()
+_index = None
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFKD', str(text))
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return re.sub(r'[^a-z0-9]+', ' ', text.lower()).strip()
+
+
+class TeamIndex:
+    def __init__(self, frame, version=None):
+        self.version = version
+        self.positions = defaultdict(dict)
+        for season in frame.index.get_level_values('Season').unique():
+            squads = frame.loc[season, 'Squad'].astype(str)
+            rows = defaultdict(list)
+            for position, squad in enumerate(squads):
+                rows[squad].append(position)
+            self.positions[int(season)] = dict(rows)
+        self.names = sorted({squad for rows in self.positions.values() for squad in rows})
+        self.normalized = {name: normalize(name) for name in self.names}
+        self.by_normalized = {norm: name for name, norm in self.normalized.items()}
+        tokens = set()
+        for name, norm in self.normalized.items():
+            tokens.add((norm, name))
+            for token in norm.split():
+                tokens.add((token, name))
+        self.tokens = sorted(tokens)
+        self.aliases = {normalize(alias): name for alias, name in ALIASES.items() if name in self.normalized}
+
+    def contains(self, season, teams):
+        season_rows = self.positions.get(int(season), {})
+        return all(team in season_rows for team in teams)
+
+    def season_teams(self, season):
+        return sorted(self.positions.get(int(season), {}))
+
+    def _prefix(self, query):
+        start = bisect.bisect_left(self.tokens, (query, ''))
+        for token, name in self.tokens[start:]:
+            if not token.startswith(query):
+                break
+            yield name
+
+    def search(self, query, limit=MAX_RESULTS):
+        query = normalize(query)
+        if not query:
+            return []
+        ranked = []
+        if query in self.aliases:
+            ranked.append(self.aliases[query])
+        ranked.extend(alias_name for alias, alias_name in self.aliases.items() if alias.startswith(query))
+        ranked.extend(sorted(self._prefix(query), key=lambda name: (not self.normalized[name].startswith(query),
+                                                                     name)))
+        ranked.extend(name for name, norm in self.normalized.items() if query in norm)
+        if not ranked:
+            names = dict(self.aliases, **self.by_normalized)
+            close = difflib.get_close_matches(query, list(names), n=limit, cutoff=0.6)
+            ranked.extend(names[norm] for norm in close)
+        seen = set()
+        results = []
+        for name in ranked:
+            if name not in seen:
+                seen.add(name)
+                results.append(name)
+                if len(results) == limit:
+                    break
+        return results
+
+
+def index():
+    global _index
+    version = data_store.version()
+    current = _index
+    if current is None or current.version != version:
+        current = TeamIndex(data_store.all_seasons_frame(), version)
+        with _lock:
+            _index = current
+    return current
+
+
+def search(query, limit=MAX_RESULTS):
+    return index().search(query, limit)
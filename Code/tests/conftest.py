@@ -0,0 +1,5 @@
+import os
+import sys
+
+os.environ.setdefault('DATA_WATCH_INTERVAL', '0')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,12 @@
+import pandas as pd
+import analytics
+import data_store
+
+
+def test_churn_promoted_is_unknown_for_the_first_season():
+    churn = analytics.churn_table()
+    first = churn['Season'] == data_store.seasons()[0]
+    assert churn.loc[first, 'promoted'].isna().all()
+    assert churn.loc[~first, 'promoted'].notna().all()
+    assert (churn.loc[first, 'relegated'] > 0).all()
+    assert pd.api.types.is_integer_dtype(churn['promoted'])
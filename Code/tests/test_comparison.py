@@ -0,0 +1,20 @@
+import numpy as np
+import comparison
+
+
+def test_stat_array_per_game():
+    values = comparison.stat_array(['Arsenal'], [0], 'per_game')
+    assert values.shape == (1, 1, len(comparison.STATS))
+    # Arsenal 2015/16: 38 games, 20-11-7, 65:36, 71 points.
+    expected = np.array([38, 20, 11, 7, 65, 36, 29, 71]) / 38
+    expected[0] = 1.0
+    np.testing.assert_allclose(values[0, 0], expected)
+
+
+def test_stat_array_keeps_a_nan_row_for_a_missing_team_season():
+    # Aston Villa were relegated in 2015/16 and did not play in 2016/17.
+    values = comparison.stat_array(['Aston Villa', 'Arsenal'], [0, 1])
+    assert values.shape == (2, 2, len(comparison.STATS))
+    assert not np.isnan(values[0, 0]).any()
+    assert np.isnan(values[0, 1]).all()
+    assert not np.isnan(values[1]).any()
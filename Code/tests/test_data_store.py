@@ -0,0 +1,58 @@
+import os
+import pandas as pd
+import pytest
+import data_store
+
+
+@pytest.fixture(scope='module')
+def report():
+    data_store.load()
+    return data_store.memory_report()
+
+
+def test_memory_report_has_a_row_per_season_and_totals(report):
+    seasons = data_store.seasons()
+    assert list(report.index) == seasons + ['seasons total', 'combined frame']
+    assert (report.loc[seasons, 'bytes'] > 0).all()
+
+
+def test_memory_report_totals_sum_the_seasons(report):
+    seasons = data_store.seasons()
+    assert report.loc['seasons total', 'bytes'] == report.loc[seasons, 'bytes'].sum()
+    assert report.loc['seasons total', 'rows'] == report.loc[seasons, 'rows'].sum()
+    assert report.loc['combined frame', 'rows'] == len(data_store.all_seasons_frame())
+
+
+def test_compact_schema_is_smaller_than_default_dtypes(report):
+    for season, path in data_store.season_files().items():
+        default = pd.read_csv(path, thousands=',').memory_usage(deep=True).sum()
+        assert report.loc[season, 'bytes'] < default
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for path in data_store.season_files().values():
+        (tmp_path / os.path.basename(path)).write_bytes(open(path, 'rb').read())
+    yield tmp_path
+    data_store.load()
+
+
+def test_load_rejects_a_malformed_file(data_dir):
+    (data_dir / 'Big_5_9.csv').write_text('a,b\n1,2\n')
+    data_store.load(str(data_dir))
+    assert 9 not in data_store.seasons()
+    assert 9 in data_store._rejected
+    assert data_store.refresh(str(data_dir)) == []
+
+
+def test_load_ignores_a_columnar_file_without_matching_csvs(data_dir):
+    pytest.importorskip('pyarrow')
+    import convert_data
+    convert_data.convert(str(data_dir))
+    seasons = sorted(data_store.season_files(str(data_dir)))
+    os.remove(str(data_dir / ('Big_5_%d.csv' % seasons[-1])))
+    data_store.load(str(data_dir))
+    assert data_store.seasons() == seasons[:-1]
+    assert all(data_store.season_fingerprint(season).split('-')[1] != 'None' for season in seasons[:-1])
+    assert data_store.refresh(str(data_dir)) == []
+    assert data_store.seasons() == seasons[:-1]
@@ -0,0 +1,29 @@
+import data_store
+import quality
+
+
+def season_frame(season=0):
+    data_store.load()
+    return data_store.long_frame({season: data_store.season_frame(season)})
+
+
+def test_current_data_has_only_warnings():
+    data_store.load()
+    report = quality.validate(data_store.long_frame({s: data_store.season_frame(s) for s in data_store.seasons()}))
+    assert quality.rejected_seasons(report) == []
+
+
+def test_goal_difference_mismatch_is_an_error():
+    frame = season_frame()
+    frame.iloc[0, frame.columns.get_loc('GD')] += 1
+    report = quality.validate(frame)
+    assert quality.rejected_seasons(report) == [0]
+    assert 'goal_difference' in set(report['check'])
+
+
+def test_season_without_league_status_is_only_warned():
+    frame = season_frame()
+    frame['League_Status'] = None
+    report = quality.validate(frame)
+    assert quality.rejected_seasons(report) == []
+    assert set(report.loc[report['check'] == 'relegated_count', 'severity']) == {'warning'}
@@ -0,0 +1,97 @@
+import threading
+import data_store
+import single_flight
+
+# Ready-to-serve table records, built once per season from the season store.
+# Callbacks look results up here instead of masking and sorting on every click.
+
+LEAGUES = ['ENG', 'GER', 'FRA', 'ESP', 'ITA']
+LEAGUE_COLUMNS = ['LgRk', 'Squad', 'MP', 'W', 'D', 'L', 'GF', 'GA', 'GD', 'Pts']
+SUMMARY_COLUMNS = ['Squad', 'Pts', 'Country', 'Top Team Scorer', 'Goalkeeper']
+
+_lock = threading.Lock()
+_views = {}
+
+
+def league_table(pL, league):
+    league_team = pL[pL['Country'] == league]
+    league_team_names = league_team.sort_values(by='LgRk', ascending=True)
+    return league_team_names
+
+
+def winning_team(pL):
+    win_team = pL[pL["LgRk"] == 1].sort_values(by='Pts', ascending=False)
+    return win_team
+
+
+def relegated_teams(pL):
+    rel_team = pL[pL["League_Status"] == "Relegated"].sort_values(by='Pts', ascending=False)
+    return rel_team
+
+
+def table_columns(columns):
+    return [{"name": i, "id": i} for i in columns]
+
+
+def build_season(season):
+    pL = data_store.season_frame(season)
+    return {
+        'league': {league: league_table(pL, league)[LEAGUE_COLUMNS].to_dict('records')
+                   for league in pL['Country'].unique()},
+        'winners': winning_team(pL)[SUMMARY_COLUMNS].to_dict('records'),
+        'relegated': relegated_teams(pL)[SUMMARY_COLUMNS].to_dict('records'),
+        'teams': sorted(pL['Squad'].unique()),
+    }
+
+
+def build_all():
+    built = {season: (data_store.season_version(season), build_season(season)) for season in data_store.seasons()}
+    with _lock:
+        _views.clear()
+        _views.update(built)
+
+
+def season_views(season):
+    season = int(season)
+    # Read the version before the frame so a concurrent reload can only make
+    # the entry look stale, never hide newer data behind an old version.
+    version = data_store.season_version(season)
+    entry = _views.get(season)
+    if entry is None or entry[0] != version:
+        entry = single_flight.group.do(('views', season, version), lambda: _store(season, version))
+    return entry[1]
+
+
+def _store(season, version):
+    entry = (version, build_season(season))
+    with _lock:
+        _views[season] = entry
+    return entry
+
+
+def invalidate(seasons=None):
+    with _lock:
+        if seasons is None:
+            _views.clear()
+        else:
+            for season in seasons:
+                _views.pop(int(season), None)
+
+
+data_store.add_listener(invalidate)
+
+
+def league_records(season, league):
+    return season_views(season)['league'].get(league, [])
+
+
+def winner_records(season):
+    return season_views(season)['winners']
+
+
+def relegated_records(season):
+    return season_views(season)['relegated']
+
+
+def team_names(season):
+    return season_views(season)['teams']
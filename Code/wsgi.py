@@ -0,0 +1,13 @@
+import gc
+import data_store
+from application import application, app, season_figures  # noqa: F401
+
+# WSGI entry point: gunicorn --config gunicorn.conf.py wsgi:application
+# Importing application loads every season before gunicorn forks. Freezing the
+# heap afterwards keeps the garbage collector from touching (and so copying)
+# those shared pages in each worker. The season figures are built here too, so
+# workers start with a warm figure cache.
+
+for season in data_store.seasons():
+    season_figures(season)
+gc.freeze()